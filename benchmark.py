@@ -0,0 +1,147 @@
+import unknotter as ut
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from unknotter.catalog import _Catalog
+
+if len(sys.argv) not in [2, 3]:
+    print("Expected `python3 benchmark.py <output json> [<baseline json>]`.")
+    sys.exit(1)
+
+output_filename = sys.argv[1]
+baseline_filename = sys.argv[2] if len(sys.argv) == 3 else None
+
+# A benchmark is slower than the baseline if, relative to the rest of the run,
+# it takes this many times as long.
+TOLERANCE = 1.5
+
+def measure(function, min_time: float = 0.03) -> float:
+    """Return the average time in seconds of one call to `function` over a run of at least `min_time` seconds."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time: return elapsed / calls
+
+# Ladder of diagrams: catalog knots from 3 to 13 crossings, then walked diagrams up to 40,
+# then a poke of the last walked diagram, which (unlike the others) has slides.
+
+ladder: list[tuple[str, ut.Diagram]] = []
+for crossings in range(3, 14):
+    alt_status = 'a' if crossings > 10 else ''
+    ladder.append((f'{crossings}{alt_status}_1', ut.knot(crossings, 1, alt_status)))
+for crossings in [20, 30, 40]:
+    ladder.append((f'walk{crossings}', ut.random_diagram(ut.knot(3, 1), crossings, random.Random(crossings))))
+walk = ladder[-1][1]
+ladder.append(('poked42', ut.poke(walk, *ut.get_pokables(walk)[0])))
+
+benchmarks: dict[str, object] = {}
+
+def record(name: str, function):
+    benchmarks[name] = function
+
+def record_diagram(name: str, diagram: ut.Diagram):
+    pd_code = list(diagram.pd_code)
+    # Diagrams cache their canonical form, incidence and faces, so each call
+    # starts from a fresh diagram to time the work a new diagram needs.
+    fresh = lambda: ut.Diagram(pd_code)
+    edge = len(pd_code)
+
+    twisted = ut.left_positive_twist(diagram, edge)
+    poke_edges = ut.get_pokables(diagram)[0]
+    poked = ut.poke(diagram, *poke_edges)
+    unpoke_edges = ut.get_unpokables(poked)[0]
+    untwist_edge = ut.get_untwistables(twisted)[0]
+    record(f'twist/{name}', lambda: ut.left_positive_twist(fresh(), edge))
+    record(f'untwist/{name}', lambda: ut.untwist(ut.Diagram(list(twisted.pd_code)), untwist_edge))
+    record(f'poke/{name}', lambda: ut.poke(fresh(), *poke_edges))
+    record(f'unpoke/{name}', lambda: ut.unpoke(ut.Diagram(list(poked.pd_code)), *unpoke_edges))
+    slidables = ut.get_slidables(diagram)
+    if slidables:
+        record(f'slide/{name}', lambda: ut.slide(fresh(), *slidables[0]))
+
+    record(f'enumerate/{name}', lambda: [
+        enumerate_moves(fresh()) for enumerate_moves in
+        [ut.get_untwistables, ut.get_pokables, ut.get_unpokables, ut.get_slidables]])
+    record(f'walker/{name}', lambda: ut.RandomWalker(fresh(), 0, random.Random(0)).step())
+
+    record(f'kauffman_bracket/{name}', lambda: ut.kauffman_bracket(fresh()))
+    record(f'jones/{name}', lambda: ut.jones(fresh()))
+    record(f'jones_fingerprint/{name}', lambda: ut.jones_fingerprint(fresh()))
+    record(f'alexander/{name}', lambda: ut.alexander(fresh()))
+    shifted = list(diagram.shift(edge).pd_code)
+    record(f'eq/{name}', lambda: fresh() == ut.Diagram(shifted))
+
+for name, diagram in ladder:
+    record_diagram(name, diagram)
+
+# Catalog, I/O and generation.
+
+record('catalog/lookup', lambda: _Catalog()['13a_1'])
+record('catalog/iterate', lambda: sum(1 for _ in _Catalog().items()))
+
+directory = tempfile.TemporaryDirectory()
+csv_filename = os.path.join(directory.name, 'data.csv')
+with open(csv_filename, 'w') as f:
+    ut.write_rows(ut.generate_dataset(list(ut.first_n_knots(4)), 8, 2000, seed=0), f, chunk_size=100)
+record('read_to_list/2000', lambda: ut.read_to_list(csv_filename))
+
+record('generate/4n8x100', lambda: list(ut.generate_dataset(list(ut.first_n_knots(4)), 8, 100, seed=0)))
+
+# Every benchmark runs once per round and keeps its best time, so a burst of
+# load on the machine slows down one run of many benchmarks rather than every
+# run of a few.
+ROUNDS = 7
+results: dict[str, float] = {name: float('inf') for name in benchmarks}
+for _ in range(ROUNDS):
+    for name, function in benchmarks.items():
+        results[name] = min(results[name], measure(function))
+directory.cleanup()
+for name, seconds in results.items():
+    print(f'{name:<32} {1e6*seconds:>12.1f} us')
+
+with open(output_filename, 'w') as f:
+    json.dump({
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }, f, indent=2)
+
+# Compare against the baseline
+
+if baseline_filename is None:
+    sys.exit(0)
+
+with open(baseline_filename) as f:
+    baseline: dict[str, float] = json.load(f)['results']
+
+# Whole runs are faster or slower from machine to machine (or from load on the
+# same machine), so each ratio is compared with the median ratio of the run.
+ratios = {name: seconds / baseline[name] for name, seconds in results.items() if name in baseline}
+machine_ratio = statistics.median(ratios.values())
+
+print()
+print(f'Median ratio to the baseline: {machine_ratio:.2f}')
+print(f'{"benchmark":<32} {"baseline":>12} {"current":>12} {"ratio":>8} {"relative":>9}')
+slower: list[str] = []
+for name, ratio in ratios.items():
+    relative = ratio / machine_ratio
+    flag = ''
+    if relative > TOLERANCE:
+        slower.append(name)
+        flag = ' slower'
+    elif relative < 1 / TOLERANCE:
+        flag = ' faster'
+    print(f'{name:<32} {1e6*baseline[name]:>10.1f}us {1e6*results[name]:>10.1f}us {ratio:>8.2f} {relative:>9.2f}{flag}')
+
+if slower:
+    print(f'{len(slower)} benchmark(s) slower than the rest of the run by more than {TOLERANCE}x relative to the baseline.')
+    sys.exit(1)
@@ -1,23 +1,19 @@
 import unknotter as ut
 import sys
 
-if len(sys.argv) != 4:
-    print("Expected `python3 genknot.py <knot 0-4> <# crossings> <data size>`.")
-    sys.exit(1)
+if __name__ == '__main__':
+    if not 4 <= len(sys.argv) <= 6:
+        print("Expected `python3 genknot.py <knot 0-4> <# crossings> <data size> [seed] [# workers]`.")
+        sys.exit(1)
 
-knotid = int(sys.argv[1])
-crossing_count = int(sys.argv[2])
-data_size = int(sys.argv[3])
+    knotid = int(sys.argv[1])
+    crossing_count = int(sys.argv[2])
+    data_size = int(sys.argv[3])
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else 1
 
-knot_choices = list(ut.first_n_knots(knotid+1))
+    knot_choices = list(ut.first_n_knots(knotid+1))
 
-knots: list[ut.Diagram] = []
-for i in range(data_size):
-    knot = knot_choices[-1][1]
-    while len(knot.pd_code) < crossing_count:
-        knot = ut.apply_random_move(knot, 0)
-    knots.append(knot)
+    data = ut.generate_dataset(knot_choices[-1:], crossing_count, data_size, seed, workers)
 
-data = [[knot_choices[-1][0], ut.get_plaintext_code(knot)] for i, knot in enumerate(knots)]
-
-print('\n'.join(','.join(line) for line in data))
+    ut.write_rows(data, chunk_size=100)
@@ -0,0 +1,26 @@
+import unknotter as ut
+import sys
+
+if __name__ == '__main__':
+    if not 5 <= len(sys.argv) <= 8:
+        print("Expected `python3 harvest.py <# knots> <crossings,...> <data size> <csv file pattern> [seed] [# workers] [interval]`.")
+        print("Each crossing count is written to the pattern with {} replaced by the count, such as data/2n{}x.csv.")
+        sys.exit(1)
+
+    knot_count = int(sys.argv[1])
+    crossing_counts = [int(count) for count in sys.argv[2].split(',')]
+    data_size = int(sys.argv[3])
+    pattern = sys.argv[4]
+    seed = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    workers = int(sys.argv[6]) if len(sys.argv) > 6 else 1
+    interval = int(sys.argv[7]) if len(sys.argv) > 7 else 10
+
+    knot_choices = list(ut.first_n_knots(knot_count))
+
+    files = {count: open(pattern.format(count), 'a') for count in crossing_counts}
+    try:
+        for count, row in ut.harvest_dataset(knot_choices, crossing_counts, data_size, seed, workers, interval=interval):
+            ut.write_rows([row], files[count])
+    finally:
+        for file in files.values():
+            file.close()
@@ -0,0 +1,15 @@
+#!/bin/sh
+
+# Like genAll.sh, but each run harvests every crossing count from the same walks.
+
+echo "Harvesting 300000 diagrams per data subset..." > "data/progress.txt"
+
+for i in {1..30}; do
+    echo "Iteration $i." >> "data/progress.txt"
+    for n in 2 3 4 5; do
+        echo -n "${n}n..." >> "data/progress.txt"
+        python3 ./harvest.py $n 6,8,10,12,14,16,18 10000 "data/${n}n{}x300k.csv"
+    done
+    echo "Subset complete." >> "data/progress.txt"
+done
+echo "All data complete." >> "data/progress.txt"
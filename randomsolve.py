@@ -3,16 +3,16 @@ import unknotter as ut
 # UNKNOT SOLVER
 
 thwt = ut.THISTLETHWAITE_UNKNOT
-ut.unknot_solver(thwt, 2)
+print(ut.parallel_tempering(thwt, time_limit=10))
 
 trefoil = ut.knot(3, 1)
-ut.unknot_solver(trefoil, 2)
+print(ut.parallel_tempering(trefoil, time_limit=10))
 
 figure8 = ut.knot(4, 1)
-ut.unknot_solver(figure8, 2)
+print(ut.parallel_tempering(figure8, time_limit=10))
 
 bigknot = ut.knot(9, 15)
-ut.unknot_solver(bigknot, 2)
+print(ut.parallel_tempering(bigknot, time_limit=10))
 
 myknot = ut.knot(0, 1)
 target_jones = ut.kauffman_bracket(myknot)
@@ -0,0 +1,25 @@
+from tests.__init__ import *
+from unknotter.polynomial import LaurentPolynomial
+import random
+from unknotter.generation import random_diagram
+
+def test_catalog_alexander():
+    assert alexander(knot(3, 1)) == LaurentPolynomial.from_dict({-1: 1, 0: -1, 1: 1})
+    assert alexander(knot(4, 1)) == LaurentPolynomial.from_dict({-1: -1, 0: 3, 1: -1})
+    assert alexander(knot(5, 2)) == LaurentPolynomial.from_dict({-1: 2, 0: -3, 1: 2})
+    assert alexander(knot(8, 19)) == LaurentPolynomial.from_dict({-3: 1, -2: -1, 0: 1, 2: -1, 3: 1})
+
+def test_unknot_alexander():
+    for diagram in [Diagram([]), Diagram([(1, 2, 2, 1)]), Diagram([(1, 1, 2, 2)]), THISTLETHWAITE_UNKNOT, OCHIAI_UNKNOT]:
+        assert alexander(diagram) == LaurentPolynomial.one()
+        assert determinant(diagram) == 1
+
+def test_alexander_is_invariant():
+    for seed in range(3):
+        assert alexander(random_diagram(knot(5, 2), 20, random.Random(seed))) == alexander(knot(5, 2))
+    assert alexander(reflect(knot(3, 1))) == alexander(knot(3, 1))
+
+def test_determinant_matches_jones():
+    for diagram in [knot(3, 1), knot(4, 1), knot(6, 2), knot(7, 4), knot(9, 42), knot(10, 132)]:
+        jones_at_minus_one = sum(coefficient * (-1)**exponent for exponent, coefficient in jones(diagram).terms())
+        assert determinant(diagram) == abs(jones_at_minus_one)
@@ -0,0 +1,19 @@
+from tests.__init__ import *
+
+def test_shift_invariance():
+    for n in range(10):
+        assert knot(5, 2).shift(n).canonical() == knot(5, 2).canonical()
+
+def test_crossing_order_invariance():
+    diagram = knot(6, 2)
+    assert Diagram(list(reversed(diagram.pd_code))) == diagram
+
+def test_distinct_knots():
+    assert knot(5, 1) != knot(5, 2)
+    assert len({knot(3, 1), knot(3, 1).shift(2), knot(4, 1), knot(4, 1).shift(3)}) == 2
+
+def test_symmetry_canonical():
+    trefoil = knot(3, 1)
+    assert reflect(trefoil) != trefoil
+    assert reflect(trefoil).canonical(up_to_symmetry=True) == trefoil.canonical(up_to_symmetry=True)
+    assert reverse(trefoil).canonical(up_to_symmetry=True) == trefoil.canonical(up_to_symmetry=True)
@@ -0,0 +1,24 @@
+from tests.__init__ import *
+import unknotter.catalog as catalog
+
+def test_catalog_index_is_current(tmp_path):
+    # Rebuild with `catalog._write_index()` after editing knotinfo.csv.
+    index_path = str(tmp_path / 'knotinfo.idx')
+    catalog._write_index(index_path)
+    with open(index_path) as new, open(catalog._INDEX_PATH) as current:
+        assert new.read() == current.read()
+
+def test_catalog_lookup():
+    assert knot(3, 1).pd_code == [(2, 5, 3, 6), (4, 1, 5, 2), (6, 3, 1, 4)]
+    assert len(knot(11, 1, 'a').pd_code) == 11
+    with pytest.raises(KeyError):
+        knot(3, 2)
+    names = [name for name, _ in catalog._knot_catalog.items()]
+    assert names[:4] == ['0_1', '3_1', '4_1', '5_1']
+    assert names == list(catalog._knot_catalog)
+
+def test_catalog_without_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(catalog, '_INDEX_PATH', str(tmp_path / 'missing.idx'))
+    knots = catalog._Catalog()
+    assert knots['4_1'] == catalog._knot_catalog['4_1']
+    assert len(knots) == len(catalog._knot_catalog)
@@ -0,0 +1,34 @@
+from tests.__init__ import *
+import random
+from unknotter.generation import random_diagram
+
+def test_fox_colorings():
+    assert fox_colorings(knot(3, 1), 3) == 9
+    assert fox_colorings(knot(3, 1), 5) == 5
+    assert fox_colorings(knot(4, 1), 5) == 25
+    assert fox_colorings(knot(4, 1), 3) == 3
+    # 8_18 has determinant 45, and its 3-colorings form a plane.
+    assert fox_colorings(knot(8, 18), 3) == 27
+
+def test_unknot_colorings():
+    for diagram in [Diagram([]), Diagram([(1, 2, 2, 1)]), THISTLETHWAITE_UNKNOT, OCHIAI_UNKNOT]:
+        assert [fox_colorings(diagram, p) for p in [2, 3, 5, 7]] == [2, 3, 5, 7]
+        assert not is_colorable(diagram)
+
+def test_colorings_match_determinant():
+    for diagram in [knot(5, 2), knot(6, 1), knot(7, 4), knot(9, 35), knot(10, 123)]:
+        for p in COLORING_PRIMES:
+            assert (fox_colorings(diagram, p) > p) == (determinant(diagram) % p == 0)
+
+def test_colorings_are_invariant():
+    diagram = random_diagram(knot(3, 1), 15, random.Random(0))
+    assert fox_colorings(diagram, 3) == 9
+    assert is_colorable(diagram)
+    assert not is_colorable(knot(3, 1), primes=[5, 7])
+
+def test_fox_colorings_batch():
+    np = pytest.importorskip('numpy')
+    diagrams = [knot(3, 1), Diagram([]), knot(4, 1), THISTLETHWAITE_UNKNOT, knot(8, 18), random_diagram(knot(6, 1), 12, random.Random(1))]
+    counts = fox_colorings_batch(diagrams, [3, 5, 7, 11])
+    assert counts.tolist() == [[fox_colorings(diagram, p) for p in [3, 5, 7, 11]] for diagram in diagrams]
+    assert fox_colorings_batch([]).shape == (0, len(COLORING_PRIMES))
@@ -0,0 +1,35 @@
+import io
+from tests.__init__ import *
+from unknotter.csvreader import *
+from unknotter.catalog import _raw_pd_to_pd
+
+ROWS = [
+    ['3_1', '[[2;5;3;6];[4;1;5;2];[6;3;1;4]]'],
+    ['4_1', '[[4;2;5;1];[8;6;1;5];[6;3;7;4];[2;7;3;8]]'],
+    ['3_1', '[[1;5;2;4];[3;1;4;6];[5;3;6;2]]'],
+]
+
+def _write_dataset(tmp_path) -> str:
+    filename = str(tmp_path / 'data.csv')
+    with open(filename, 'w') as f:
+        write_rows(ROWS, f, chunk_size=2)
+    return filename
+
+def test_write_rows():
+    file = io.StringIO()
+    write_rows(iter(ROWS), file)
+    assert file.getvalue() == ''.join(','.join(row) + '\n' for row in ROWS)
+
+def test_read_rows(tmp_path):
+    filename = _write_dataset(tmp_path)
+    assert list(read_rows(filename)) == [(name, _raw_pd_to_pd(raw_pd)) for name, raw_pd in ROWS]
+    assert read_to_list(filename) == list(read_rows(filename))
+    # A count skips the first line, as `read_to_list` always has.
+    assert [name for name, _ in read_rows(filename, 1)] == ['4_1']
+    assert [name for name, _ in read_rows(filename, labels={'3_1'})] == ['3_1', '3_1']
+
+def test_read_chunks(tmp_path):
+    filename = _write_dataset(tmp_path)
+    chunks = list(read_chunks(filename, 2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert sum(chunks, []) == list(read_rows(filename))
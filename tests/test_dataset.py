@@ -0,0 +1,45 @@
+import pytest
+from tests.__init__ import *
+
+np = pytest.importorskip('numpy')
+from unknotter.dataset import *
+
+ROWS = [
+    ('3_1', knot(3, 1).pd_code),
+    ('4_1', knot(4, 1).pd_code),
+    ('3_1', '[[1;5;2;4];[3;1;4;6];[5;3;6;2]]'),
+]
+
+def test_dataset_rows(tmp_path):
+    filename = str(tmp_path / 'data.ukd')
+    write_dataset(filename, ROWS)
+    dataset = Dataset(filename)
+    assert len(dataset) == 3
+    assert dataset.label_names == ['3_1', '4_1']
+    assert dataset.labels.tolist() == [0, 1, 0]
+    assert dataset[0] == ROWS[0]
+    assert dataset[1] == ROWS[1]
+    assert dataset[2] == ('3_1', [(1, 5, 2, 4), (3, 1, 4, 6), (5, 3, 6, 2)])
+
+def test_dataset_matrix(tmp_path):
+    filename = str(tmp_path / 'data.ukd')
+    write_dataset(filename, ROWS)
+    dataset = Dataset(filename)
+    matrix = dataset.matrix(5)
+    assert matrix.shape == (3, 20)
+    assert matrix[1, :16].tolist() == [edge for crossing in ROWS[1][1] for edge in crossing]
+    assert not matrix[0, 12:].any()
+    # Rows of the same size are a view of the file.
+    assert not dataset.matrix(3, 2, 3).flags.writeable
+    with pytest.raises(ValueError):
+        dataset.matrix(3)
+    chunks = list(dataset.chunks(2, 4))
+    assert [labels.tolist() for labels, _ in chunks] == [[0, 1], [0]]
+    assert np.array_equal(np.concatenate([matrix for _, matrix in chunks]), dataset.matrix(4))
+
+def test_empty_dataset(tmp_path):
+    filename = str(tmp_path / 'data.ukd')
+    write_dataset(filename, [])
+    dataset = Dataset(filename)
+    assert len(dataset) == 0
+    assert dataset.matrix(3).shape == (0, 12)
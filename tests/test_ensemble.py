@@ -0,0 +1,34 @@
+import pytest
+from tests.__init__ import *
+
+np = pytest.importorskip('numpy')
+from unknotter.ensemble import Ensemble, _TWISTS
+from unknotter.properties import _is_valid
+
+def test_ensemble_twists_match():
+    figure_eight = knot(4, 1)
+    for edge in range(1, 9):
+        for kind, twist in enumerate(_TWISTS):
+            ensemble = Ensemble([figure_eight], 6)
+            ensemble._twist(np.array([0]), np.array([edge]), np.array([kind]))
+            assert ensemble.diagram(0).pd_code == twist(figure_eight, edge).pd_code
+
+def test_ensemble_pokes_match():
+    trefoil = knot(3, 1)
+    for crossing_index, crossing in enumerate(trefoil.pd_code):
+        for corner in range(4):
+            lower_edge, higher_edge = sorted((crossing[corner], crossing[corner - 1]))
+            ensemble = Ensemble([trefoil], 6)
+            assert ensemble._poke(np.array([0]), np.array([crossing_index]), np.array([corner]), np.array([True]))[0]
+            assert jones(ensemble.diagram(0)) == jones(trefoil)
+            face_ccw, face_cw = trefoil._get_adjacent_faces(lower_edge)
+            if (higher_edge in face_ccw or -higher_edge in face_ccw) != (higher_edge in face_cw or -higher_edge in face_cw):
+                assert ensemble.diagram(0).pd_code == poke(trefoil, lower_edge, higher_edge).pd_code
+
+def test_ensemble_run():
+    ensemble = Ensemble([knot(3, 1), knot(4, 1)]*10, [8, 10]*10, rng=np.random.default_rng(0))
+    diagrams = ensemble.run()
+    assert not ensemble.active().any()
+    for i, diagram in enumerate(diagrams):
+        assert len(diagram.pd_code) in ([8, 9], [10, 11])[i % 2]
+        assert _is_valid(diagram)
@@ -0,0 +1,43 @@
+from tests.__init__ import *
+import cmath
+import random
+from unknotter.generation import random_diagram
+from unknotter.polynomial import LaurentPolynomial
+
+DIAGRAMS = [knot(3, 1), knot(4, 1), knot(8, 19), THISTLETHWAITE_UNKNOT, Diagram([(1, 1, 2, 2)]), Diagram([(1, 2, 2, 1)])]
+
+def test_bracket_at_complex():
+    a = cmath.exp(0.37j)
+    for diagram in DIAGRAMS:
+        assert abs(bracket_at(diagram, a) - kauffman_bracket(diagram)(a)) < 1e-9
+        assert abs(jones_at(diagram, a) - jones(diagram)(a**4)) < 1e-9
+
+def test_bracket_at_modular():
+    modulus = 1_000_003
+    for diagram in DIAGRAMS:
+        bracket = kauffman_bracket(diagram)
+        expected = sum(coefficient * pow(2, exponent, modulus) for exponent, coefficient in bracket.terms()) % modulus
+        assert bracket_at(diagram, 2, modulus) == expected
+
+def test_bracket_at_array():
+    np = pytest.importorskip('numpy')
+    points = np.exp(1j*np.linspace(0.1, 3, 16))
+    bracket = kauffman_bracket(knot(8, 19))
+    assert np.allclose(bracket_at(knot(8, 19), points), [bracket(point) for point in points])
+
+def test_jones_fingerprint():
+    assert jones_fingerprint(THISTLETHWAITE_UNKNOT) == jones_fingerprint(Diagram([(1, 2, 2, 1)])) == 1
+    assert jones_fingerprint(random_diagram(knot(5, 2), 15, random.Random(0))) == jones_fingerprint(knot(5, 2))
+    fingerprints = {jones_fingerprint(diagram) for _, diagram in first_n_knots(30)}
+    assert len(fingerprints) == 30
+
+def test_laurent_call_array():
+    np = pytest.importorskip('numpy')
+    polynomial = LaurentPolynomial.from_dict({-2: 1, 0: -3, 3: 2})
+    points = np.array([0.5, 1.0, 2.0, -1.5])
+    assert np.allclose(polynomial(points), [polynomial(float(point)) for point in points])
+    assert polynomial(np.array([1, 2]))[1] == polynomial(2)
+    quarter = jones(knot(3, 1)).divide_exponents(4)
+    points = np.exp(1j*np.linspace(0, 3, 8))
+    assert np.allclose(quarter(points), [sum(c * complex(p)**float(e) for e, c in quarter.terms()) for p in points])
+    assert LaurentPolynomial.zero()(points).shape == points.shape
@@ -0,0 +1,20 @@
+from tests.__init__ import *
+
+def test_trefoil_faces():
+    faces = knot(3, 1).faces()
+    assert len(faces.faces) == 5
+    assert faces.histogram == {2: 3, 3: 2}
+
+def test_figure8_faces():
+    faces = knot(4, 1).faces()
+    assert len(faces.faces) == 6
+    assert faces.histogram == {2: 2, 3: 4}
+
+def test_edge_faces_match_adjacent_faces():
+    diagram = poke(knot(4, 1), 1, 4)
+    faces = diagram.faces()
+    for edge in get_edges(diagram):
+        face_ccw, face_cw = diagram._get_adjacent_faces(edge)
+        ccw_index, cw_index = faces.edge_faces[edge]
+        assert {abs(e) for e in face_ccw} == {abs(e) for e in faces.faces[ccw_index]}
+        assert {abs(e) for e in face_cw} == {abs(e) for e in faces.faces[cw_index]}
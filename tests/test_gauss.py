@@ -0,0 +1,53 @@
+from tests.__init__ import *
+import random
+from unknotter.generation import random_diagram
+
+def _diagrams() -> list[Diagram]:
+    diagrams = [knot(3, 1), knot(4, 1), knot(8, 19), knot(11, 1, 'n'), THISTLETHWAITE_UNKNOT, OCHIAI_UNKNOT]
+    diagrams += [random_diagram(knot(3, 1), 15, random.Random(seed)) for seed in range(5)]
+    return diagrams
+
+def test_trefoil_notation():
+    assert gauss_code(knot(3, 1)) == [1, -2, 3, -1, 2, -3]
+    assert gauss_signs(knot(3, 1)) == [-1, -1, -1]
+    assert dt_notation(knot(3, 1)) == [4, 6, 2]
+    assert dt_signs(knot(3, 1)) == [-1, -1, -1]
+
+def test_gauss_code_round_trip():
+    for diagram in _diagrams():
+        code, signs = gauss_code(diagram), gauss_signs(diagram)
+        assert sum(signs) == get_writhe(diagram)
+        assert from_gauss_code(code, signs).identical(diagram)
+
+def test_dt_notation_round_trip():
+    for diagram in _diagrams():
+        assert from_dt_notation(dt_notation(diagram), dt_signs(diagram)).identical(diagram)
+
+def test_one_crossing_round_trip():
+    for pd_code in [[(1, 2, 2, 1)], [(2, 1, 1, 2)], [(1, 1, 2, 2)], [(2, 2, 1, 1)]]:
+        diagram = Diagram(pd_code)
+        assert from_gauss_code(gauss_code(diagram), gauss_signs(diagram)).pd_code == pd_code
+        assert unpack_gauss_code(pack_gauss_code(diagram)).pd_code == pd_code
+
+def test_pack_gauss_code():
+    for diagram in _diagrams() + [Diagram([])]:
+        packed = pack_gauss_code(diagram)
+        assert unpack_gauss_code(packed).identical(diagram)
+        assert pack_gauss_code(Diagram(list(reversed(diagram.pd_code)))) == packed
+    assert len(pack_gauss_code(knot(3, 1))) == 1 + 6 + 1
+
+def test_pack_gauss_code_wide():
+    # The (2, n) torus knot, with passes too many for one byte each.
+    for n in [127, 129, 301]:
+        torus = from_dt_notation(list(range(n + 1, 2*n + 1, 2)) + list(range(2, n, 2)), [1]*n)
+        assert validate(torus, 'full')
+        packed = pack_gauss_code(torus)
+        assert unpack_gauss_code(packed).identical(torus)
+
+def test_invalid_notation():
+    with pytest.raises(ValueError):
+        gauss_code(Diagram([(1, 5, 3, 4), (2, 1, 4, 6), (5, 3, 6, 2)]))
+    with pytest.raises(ValueError):
+        from_gauss_code([1, -1, 1], [1])
+    with pytest.raises(ValueError):
+        from_dt_notation([4, 4], [1, 1])
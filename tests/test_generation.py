@@ -0,0 +1,38 @@
+from tests.__init__ import *
+from unknotter.generation import *
+from unknotter.catalog import _raw_pd_to_pd
+
+def test_generate_dataset_rows():
+    knots = [('3_1', knot(3, 1)), ('4_1', knot(4, 1))]
+    rows = list(generate_dataset(knots, 6, 10, seed=0, chunk_size=3))
+    assert [name for name, _ in rows] == ['3_1', '4_1']*5
+    for _, code in rows:
+        assert code.count(';') + 1 >= 4*6
+
+def test_generate_dataset_reproducible():
+    knots = [('3_1', knot(3, 1)), ('4_1', knot(4, 1))]
+    serial = list(generate_dataset(knots, 6, 10, seed=1, workers=1, chunk_size=3))
+    parallel = list(generate_dataset(knots, 6, 10, seed=1, workers=2, chunk_size=3))
+    assert serial == parallel
+    assert serial != list(generate_dataset(knots, 6, 10, seed=2, workers=1, chunk_size=3))
+
+def test_harvest_buckets():
+    import random
+    buckets = harvest(knot(3, 1), [6, 9, 12], 5, interval=4, width=2, rng=random.Random(0))
+    assert sorted(buckets) == [6, 9, 12]
+    for count, diagrams in buckets.items():
+        assert len(diagrams) == 5
+        assert all(count <= len(diagram.pd_code) < count + 2 for diagram in diagrams)
+    with pytest.raises(ValueError):
+        harvest(knot(8, 1), [4], 1)
+
+def test_harvest_dataset():
+    knots = [('3_1', knot(3, 1)), ('4_1', knot(4, 1))]
+    rows = list(harvest_dataset(knots, [6, 8], 5, seed=0, chunk_size=2))
+    assert len(rows) == 10
+    for count in [6, 8]:
+        names = [row[0] for row_count, row in rows if row_count == count]
+        assert names == ['3_1', '4_1', '3_1', '4_1', '3_1']
+    for count, (_, code) in rows:
+        assert count <= len(_raw_pd_to_pd(code)) < count + 2
+    assert rows == list(harvest_dataset(knots, [6, 8], 5, seed=0, chunk_size=2, workers=2))
@@ -0,0 +1,23 @@
+import random
+from tests.__init__ import *
+from unknotter.identification import *
+from unknotter.generation import random_diagram
+
+def test_identify_catalog_knots():
+    assert identify(knot(3, 1)) == ['3_1']
+    assert identify(knot(8, 19)) == ['8_19']
+    assert identify(THISTLETHWAITE_UNKNOT) == ['0_1']
+
+def test_identify_mirror():
+    assert jones(reflect(knot(3, 1))) == jones(knot(3, 1)).inverted()
+    assert identify(reflect(knot(3, 1))) == ['3_1']
+
+def test_identify_random_diagram():
+    diagram = random_diagram(knot(5, 2), 12, random.Random(0))
+    assert '5_2' in identify(diagram)
+    assert all(int(name.split('_')[0].rstrip('an')) <= len(diagram.pd_code) for name in identify(diagram))
+
+def test_identify_module_is_not_shadowed():
+    import unknotter.identification
+    assert unknotter.identification.identify is identify
+    assert unknotter.identify is identify
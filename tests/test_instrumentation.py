@@ -0,0 +1,46 @@
+import json
+import random
+from tests.__init__ import *
+from unknotter.instrumentation import *
+import unknotter.instrumentation as instrumentation
+
+def test_instrument_off():
+    assert instrumentation._active is None
+    left_positive_twist(knot(3, 1), 2)
+    assert instrumentation._active is None
+
+def test_instrument_counts():
+    with instrument() as stats:
+        diagram = knot(4, 1)
+        for i in range(20):
+            diagram = apply_random_move(diagram, 0, random.Random(i))
+    assert instrumentation._active is None
+    # Every rejected move is retried with a fresh enumeration.
+    moves = sum(stats.calls.get(name, 0) for name in MOVES)
+    assert stats.calls['get_pokables'] == moves == 20 + sum(stats.rejections.values())
+    assert sum(stats.sizes.values()) == moves
+    assert set(stats.category_time) == {'enumerate', 'move'}
+
+def test_instrument_rejections():
+    with instrument() as stats:
+        with pytest.raises(ReidemeisterError):
+            untwist(knot(3, 1), 3)
+    assert stats.calls == stats.rejections == {'untwist': 1}
+
+def test_instrument_recursion():
+    with instrument() as stats:
+        # Twisting the first edge twists a shifted diagram recursively.
+        left_positive_twist(knot(3, 1), 1)
+    assert stats.calls == {'left_positive_twist': 1}
+
+def test_instrument_dump(tmp_path):
+    with instrument(trace=True) as stats:
+        jones(knot(3, 1))
+    stats.dump_json(str(tmp_path / 'stats.json'))
+    stats.dump_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(tmp_path / 'stats.json') as f:
+        assert json.load(f)['calls'] == {'jones': 1, 'kauffman_bracket': 1}
+    with open(tmp_path / 'trace.json') as f:
+        events = json.load(f)['traceEvents']
+    assert [event['name'] for event in events] == ['kauffman_bracket', 'jones']
+    assert all(event['ph'] == 'X' for event in events)
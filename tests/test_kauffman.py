@@ -15,3 +15,12 @@ def test_figure8_preserve_poke():
     assert kauffman_bracket(knot(4, 1)) == kauffman_bracket(poke(knot(4, 1), 1, 4))
     assert kauffman_bracket(knot(4, 1)) == kauffman_bracket(poke(knot(4, 1), 3, 8))
     assert kauffman_bracket(knot(4, 1)) == kauffman_bracket(poke(knot(4, 1), 2, 5))
+
+def test_three_twist_bracket():
+    assert kauffman_bracket(knot(5, 2)) == Polynomial({-11: -1, -7: 1, -3: -2, 1: 1, 5: -1, 9: 1})
+
+def test_stevedore_bracket():
+    assert kauffman_bracket(knot(6, 1)) == Polynomial({-14: 1, -10: -1, -6: 2, -2: -2, 2: 1, 6: -1, 10: 1})
+
+def test_thistlethwaite_unknot_jones():
+    assert jones(THISTLETHWAITE_UNKNOT) == Polynomial.one()
@@ -0,0 +1,25 @@
+from tests.__init__ import *
+from unknotter.packed import PackedDiagram
+
+def test_packed_pd_code():
+    trefoil = knot(3, 1)
+    packed = PackedDiagram(trefoil.pd_code)
+    assert list(packed.pd_code) == trefoil.pd_code
+    assert packed == trefoil
+    assert packed.to_diagram().pd_code == trefoil.pd_code
+
+def test_packed_moves_match():
+    figure_eight = knot(4, 1)
+    packed = PackedDiagram(figure_eight.pd_code)
+    for edge in range(1, 9):
+        twisted = left_positive_twist(packed, edge)
+        assert isinstance(twisted, PackedDiagram)
+        assert list(twisted.pd_code) == left_positive_twist(figure_eight, edge).pd_code
+        for untwistable in get_untwistables(twisted):
+            untwisted = untwist(twisted, untwistable)
+            assert isinstance(untwisted, PackedDiagram)
+            assert list(untwisted.pd_code) == untwist(twisted.to_diagram(), untwistable).pd_code
+    for edges in get_pokables(figure_eight):
+        poked = poke(packed, *edges)
+        assert isinstance(poked, PackedDiagram)
+        assert list(poked.pd_code) == poke(figure_eight, *edges).pd_code
@@ -35,3 +35,14 @@ def test_infinity_unknot():
 
 def test_infinity_unknot_2():
     assert poke(Diagram([(1, 1, 2, 2)]), 2, 1) == Diagram([(4, 2, 5, 1), (5, 2, 6, 3), (6, 4, 1, 3)])
+
+def test_pokes_are_planar():
+    # Pokes with the lower edge passing over used to swap the layouts of the
+    # two faces, which gave diagrams that cannot be drawn in the plane.
+    for diagram in [knot(4, 1), knot(5, 2)]:
+        bracket = kauffman_bracket(diagram)
+        for edges in get_pokables(diagram):
+            for under_edge, over_edge in [edges, edges[::-1]]:
+                poked = poke(diagram, under_edge, over_edge)
+                assert validate(poked, 'full')
+                assert kauffman_bracket(poked) == bracket
@@ -0,0 +1,35 @@
+from tests.__init__ import *
+from unknotter.polynomial import LaurentPolynomial
+
+def test_laurent_matches_polynomial():
+    p = {-3: 2, 0: -1, 4: 1}
+    q = {-1: 1, 2: 3}
+    assert LaurentPolynomial.from_dict(p) * LaurentPolynomial.from_dict(q) == Polynomial(p) * Polynomial(q)
+    assert LaurentPolynomial.from_dict(p) + LaurentPolynomial.from_dict(q) == Polynomial(p) + Polynomial(q)
+    assert LaurentPolynomial.from_dict(p)**5 == Polynomial(p)**5
+
+def test_laurent_in_place_add():
+    p = LaurentPolynomial.from_dict({2: 1})
+    p += LaurentPolynomial.from_dict({-2: 1, 2: -1})
+    assert p == LaurentPolynomial.monomial(-2)
+
+def test_laurent_rational_exponents():
+    p = LaurentPolynomial.from_dict({-8: 1, 1: 1}).divide_exponents(4)
+    assert p == Polynomial({-2: 1, 0.25: 1})
+    assert p * p == Polynomial({-4: 1, -1.75: 2, 0.5: 1})
+
+def test_laurent_exact_divide():
+    p = LaurentPolynomial.from_dict({-3: 2, 0: -1, 4: 1})
+    q = LaurentPolynomial.from_dict({-1: 1, 2: 3})
+    assert (p * q).exact_divide(q) == p
+    assert (p * q).exact_divide(p) == q
+    assert LaurentPolynomial.zero().exact_divide(q) == LaurentPolynomial.zero()
+    with pytest.raises(ValueError):
+        p.exact_divide(q)
+    with pytest.raises(ValueError):
+        LaurentPolynomial([1, 1]).exact_divide(LaurentPolynomial.monomial(0, 2))
+    with pytest.raises(ZeroDivisionError):
+        p.exact_divide(LaurentPolynomial.zero())
+
+def test_trefoil_jones():
+    assert jones(knot(3, 1)) == Polynomial({-4: -1, -3: 1, -1: 1})
@@ -0,0 +1,55 @@
+from tests.__init__ import *
+from unknotter.search import *
+
+def _replay(diagram: Diagram, moves) -> Diagram:
+    for name, edges in moves:
+        diagram = MOVES[name](diagram, *edges)
+    return diagram
+
+def test_search_unknot():
+    result = simplify_search(THISTLETHWAITE_UNKNOT)
+    assert len(result.diagram.pd_code) <= 2
+    assert _replay(THISTLETHWAITE_UNKNOT, result.moves).pd_code == result.diagram.pd_code
+
+def test_search_reproducible():
+    result = simplify_search(OCHIAI_UNKNOT)
+    again = simplify_search(OCHIAI_UNKNOT)
+    assert result.moves == again.moves
+    assert result.states == again.states
+
+def test_search_limits():
+    result = simplify_search(knot(3, 1), max_states=200)
+    assert len(result.diagram.pd_code) == 3
+    assert result.moves == []
+    assert result.states == 200
+    assert not result.exhausted
+    result = simplify_search(knot(3, 1), max_depth=1)
+    assert result.exhausted
+    assert result.states == 1 + len(get_untwistables(knot(3, 1))) + min(4, len(get_pokables(knot(3, 1))))
+
+def test_simplify_walk():
+    import random
+    from unknotter.generation import random_diagram
+    from unknotter.properties import alexander, validate
+    diagram = random_diagram(knot(5, 2), 30, random.Random(0))
+    simplified, moves = simplify(diagram)
+    assert len(simplified.pd_code) < 10
+    assert {name for name, _ in moves} <= {'untwist', 'unpoke', 'slide'}
+    assert _replay(diagram, moves).identical(simplified)
+    assert validate(simplified, 'full')
+    assert alexander(simplified) == alexander(knot(5, 2))
+
+def test_simplify_unlocking_slide():
+    import random
+    from unknotter.generation import random_diagram
+    diagram = random_diagram(knot(5, 2), 30, random.Random(2))
+    simplified, moves = simplify(diagram)
+    assert any(name == 'slide' for name, _ in moves)
+    assert _replay(diagram, moves).identical(simplified)
+
+def test_simplify_reduced():
+    for diagram in [knot(3, 1), THISTLETHWAITE_UNKNOT]:
+        simplified, moves = simplify(diagram)
+        assert simplified.pd_code == diagram.pd_code
+        assert moves == []
+    assert simplify(Diagram([(1, 2, 2, 1)]))[0].pd_code == [(1, 2, 2, 1)]
@@ -0,0 +1,27 @@
+from tests.__init__ import *
+from unknotter.solver import *
+
+def test_solver_unknot():
+    result = parallel_tempering(THISTLETHWAITE_UNKNOT, seed=0)
+    assert result.success
+    assert len(result.diagram.pd_code) <= 2
+    assert 0 < result.iterations <= 2000
+    assert len(result.acceptance_rates) == len(result.betas)
+
+def test_solver_knot():
+    result = parallel_tempering(knot(3, 1), iterations=200, swap_interval=20, seed=0)
+    assert not result.success
+    assert result.iterations == 200
+    assert len(result.diagram.pd_code) == 3
+    assert all(0 <= rate <= 1 for rate in result.acceptance_rates)
+
+def test_solver_reproducible():
+    serial = parallel_tempering(knot(4, 1), iterations=100, swap_interval=10, seed=1)
+    parallel = parallel_tempering(knot(4, 1), iterations=100, swap_interval=10, seed=1, workers=2)
+    assert serial.diagram.pd_code == parallel.diagram.pd_code
+    assert serial.acceptance_rates == parallel.acceptance_rates
+
+def test_solver_time_limit():
+    result = parallel_tempering(knot(3, 1), iterations=None, time_limit=0.2, seed=0)
+    assert not result.success
+    assert result.time < 2
@@ -0,0 +1,60 @@
+from tests.__init__ import *
+import random
+from unknotter.trajectory import *
+
+def test_walk_matches_apply_random_move():
+    diagrams = list(walk(knot(3, 1), 30, 0.5, random.Random(0)))
+    assert len(diagrams) == 31
+    assert diagrams[0] == knot(3, 1)
+    rng = random.Random(0)
+    diagram = knot(3, 1)
+    for walked in diagrams[1:]:
+        diagram = apply_random_move(diagram, 0.5, rng)
+        assert walked.pd_code == diagram.pd_code
+
+def test_walk_is_lazy():
+    walker = walk(knot(4, 1), None, 0.5, random.Random(1))
+    for _ in range(100):
+        next(walker)
+
+def test_trajectory_replay():
+    trajectory = Trajectory(knot(3, 1), checkpoint_interval=7)
+    trajectory.record(60, 0.5, random.Random(2))
+    diagrams = list(walk(knot(3, 1), 60, 0.5, random.Random(2)))
+    assert len(trajectory) == 60
+    assert [diagram.pd_code for diagram in trajectory] == [diagram.pd_code for diagram in diagrams]
+    for i in [0, 1, 6, 7, 8, 41, 60, -1]:
+        assert trajectory[i].pd_code == diagrams[i].pd_code
+    with pytest.raises(IndexError):
+        trajectory[61]
+    moves = list(trajectory.moves())
+    assert len(moves) == 60
+    assert list(trajectory.moves(30)) == moves[30:]
+
+def test_trajectory_append():
+    trajectory = Trajectory(knot(3, 1), checkpoint_interval=2)
+    trajectory.append('left_positive_twist', (1,))
+    untwist_edge = get_untwistables(trajectory[1])[0]
+    trajectory.append('untwist', (untwist_edge,))
+    trajectory.append('poke', (1, 4))
+    assert trajectory[1] == left_positive_twist(knot(3, 1), 1)
+    assert trajectory[2] == knot(3, 1)
+    assert trajectory[3] == poke(trajectory[2], 1, 4)
+    assert list(trajectory.moves()) == [('left_positive_twist', (1,)), ('untwist', (untwist_edge,)), ('poke', (1, 4))]
+
+def test_trajectory_save_load(tmp_path):
+    trajectory = Trajectory(knot(4, 1), checkpoint_interval=10)
+    trajectory.record(45, 0.5, random.Random(3))
+    filename = str(tmp_path / 'walk.uktr')
+    trajectory.save(filename)
+    loaded = Trajectory.load(filename)
+    assert list(loaded.moves()) == list(trajectory.moves())
+    assert [diagram.pd_code for diagram in loaded] == [diagram.pd_code for diagram in trajectory]
+    assert list(trajectory.load(filename).moves()) == list(trajectory.moves())
+    loaded.record(5, 0.5, random.Random(4))
+    assert len(loaded) == 50
+    assert loaded[50].pd_code == walk_last(trajectory[45], 5, random.Random(4)).pd_code
+
+def walk_last(diagram: Diagram, moves: int, rng: random.Random) -> Diagram:
+    for diagram in walk(diagram, moves, 0.5, rng): pass
+    return diagram
@@ -0,0 +1,50 @@
+from tests.__init__ import *
+import unknotter.properties as properties
+
+def test_validate_catalog():
+    for diagram in [knot(3, 1), knot(8, 19), THISTLETHWAITE_UNKNOT, OCHIAI_UNKNOT, Diagram([(1, 2, 2, 1)])]:
+        assert validate(diagram, 'full')
+
+def test_validate_curls():
+    for pd_code in [[(1, 1, 2, 2)], [(2, 2, 1, 1)], [(1, 2, 2, 1)], [(2, 1, 1, 2)]]:
+        assert validate(Diagram(pd_code), 'full')
+
+def test_validate_simplified_unknots():
+    import random
+    from unknotter.generation import random_diagram
+    from unknotter.search import simplify
+    for seed in range(10):
+        simplified, _ = simplify(random_diagram(knot(0, 1), 12, random.Random(seed)))
+        assert len(simplified.pd_code) == 1
+        assert validate(simplified, 'full')
+
+def test_validate_cheap():
+    assert not validate(Diagram([(1, 5, 2, 4), (3, 1, 4, 6), (5, 3, 7, 2)]), 'cheap')
+    assert not validate(Diagram([(1, 5, 2, 4), (3, 1, 4, 6), (5, 3, 5, 2)]), 'cheap')
+    assert validate(Diagram([(1, 5, 2, 4), (3, 1, 4, 6), (5, 3, 7, 2)]), 'off')
+
+def test_validate_orientation():
+    # The under strand of the first crossing goes from 1 to 3.
+    diagram = Diagram([(1, 5, 3, 4), (2, 1, 4, 6), (5, 3, 6, 2)])
+    assert validate(diagram, 'cheap')
+    assert not validate(diagram, 'full')
+
+def test_validate_planarity():
+    # Every crossing is oriented, but the faces are not those of a planar diagram.
+    diagram = Diagram([(1, 4, 2, 5), (3, 6, 4, 1), (5, 3, 6, 2)])
+    assert validate(diagram, 'cheap')
+    assert len(diagram.faces().faces) != len(diagram.pd_code) + 2
+    assert not validate(diagram, 'full')
+
+def test_validation_level():
+    diagram = Diagram([(1, 5, 3, 4), (2, 1, 4, 6), (5, 3, 6, 2)])
+    try:
+        properties.set_validation_level('full')
+        assert not validate(diagram)
+        properties.set_validation_level('off')
+        assert validate(Diagram([(1, 1, 1, 1)]))
+    finally:
+        properties.set_validation_level('cheap')
+    assert validate(diagram)
+    with pytest.raises(ValueError):
+        properties.set_validation_level('paranoid')
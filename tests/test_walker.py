@@ -0,0 +1,31 @@
+import random
+from collections import Counter
+from tests.__init__ import *
+from unknotter.walker import RandomWalker
+
+def _assert_candidates_match(walker: RandomWalker):
+    diagram = Diagram(walker.diagram.pd_code)
+    assert Counter(walker.untwistables()) == Counter(get_untwistables(diagram))
+    assert Counter(walker.pokables()) == Counter(get_pokables(diagram))
+    assert Counter(walker.unpokables()) == Counter(get_unpokables(diagram))
+    assert Counter(walker.slidables()) == Counter(get_slidables(diagram))
+
+def test_walker_growing_candidates():
+    walker = RandomWalker(knot(4, 1), 0, random.Random(0))
+    for _ in range(100):
+        walker.step()
+        _assert_candidates_match(walker)
+
+def test_walker_shrinking_candidates():
+    walker = RandomWalker(THISTLETHWAITE_UNKNOT, 1, random.Random(1))
+    for _ in range(100):
+        walker.step()
+        _assert_candidates_match(walker)
+
+def test_walker_named_moves():
+    walker = RandomWalker(knot(3, 1), 0)
+    walker.apply('left_positive_twist', 6)
+    _assert_candidates_match(walker)
+    walker.apply('poke', 2, 4)
+    _assert_candidates_match(walker)
+    assert walker.diagram == poke(left_positive_twist(knot(3, 1), 6), 2, 4)
@@ -14,15 +14,6 @@ data_filename = sys.argv[1]
 knot_count = int(sys.argv[2])
 crossing_count = int(sys.argv[3])
 
-# Read codes from CSV file
-if len(sys.argv) == 4:
-    dataset = ut.read_to_list(data_filename)
-else:
-    data_size = int(sys.argv[4])
-    dataset = ut.read_to_list(data_filename, data_size)
-
-labels = LabelEncoder().fit_transform([label for label, _ in dataset])
-
 # Fit codes into matrix
 
 def pd_code_to_vector(code: ut.PDNotation, num_crossings: int):
@@ -34,8 +25,25 @@ def pd_code_to_vector(code: ut.PDNotation, num_crossings: int):
         raise Exception(f'knot has more than {num_crossings} crossings')
     return code
 
-codes: list[ut.PDNotation] = [code for _, code in dataset]
-codes = [pd_code_to_vector(code, crossing_count+1) for code in codes]
+# Read codes from CSV file
+data_size = int(sys.argv[4]) if len(sys.argv) == 5 else -1
+
+if data_filename.endswith('.ukd'):
+    # Binary datasets (see `unknotter.dataset`) are memory-mapped instead of parsed.
+    import numpy as np
+    from unknotter.dataset import Dataset
+    binary_dataset = Dataset(data_filename)
+    stop = data_size if data_size >= 0 else None
+    names = np.array(binary_dataset.label_names)[binary_dataset.labels[:stop]]
+    codes = binary_dataset.matrix(crossing_count+1, stop=stop)
+else:
+    names: list[str] = []
+    codes: list[list[int]] = []
+    for name, code in ut.read_rows(data_filename, data_size):
+        names.append(name)
+        codes.append(pd_code_to_vector(code, crossing_count+1))
+
+labels = LabelEncoder().fit_transform(names)
 
 code_train, code_test, label_train, label_test = train_test_split(
     codes, labels,
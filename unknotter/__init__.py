@@ -2,5 +2,12 @@ from unknotter.catalog import *
 from unknotter.diagram import *
 from unknotter.transformations import *
 from unknotter.reidemeister import *
+from unknotter.walker import *
+from unknotter.generation import *
+from unknotter.solver import *
+from unknotter.search import *
 from unknotter.properties import *
 from unknotter.csvreader import *
+from unknotter.instrumentation import *
+from unknotter.identification import *
+from unknotter.trajectory import *
@@ -1,13 +1,78 @@
+import os
+from collections.abc import ItemsView, Iterator, Mapping
 from unknotter.diagram import Diagram, PDNotation
 from itertools import islice
 
+_CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'knotinfo.csv')
+_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'knotinfo.idx')
+
+def _scan_catalog(path: str = _CATALOG_PATH) -> Iterator[tuple[str, int, str]]:
+    """Read the catalog file line by line, yielding the name, byte offset and PD notation of each knot."""
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            name, raw_pd = line.decode().split(',')[:2]
+            yield name, offset, raw_pd
+            offset += len(line)
+
+def _write_index(path: str = _INDEX_PATH):
+    """Write the index of the catalog: its size, then the name and byte offset of each knot."""
+    with open(path, 'w') as f:
+        f.write(f'{os.path.getsize(_CATALOG_PATH)}\n')
+        f.writelines(f'{name} {offset}\n' for name, offset, _ in _scan_catalog())
+
+class _CatalogItems(ItemsView):
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        for name, _, raw_pd in _scan_catalog():
+            yield name, raw_pd
+
+class _Catalog(Mapping):
+    """The pre-defined prime knots, mapping each name to its PD notation as written in `knotinfo.csv`.
+
+    Nothing is read until the catalog is first used. Looking up a knot reads the
+    offsets from the prebuilt index `knotinfo.idx` and then only the one line of
+    the catalog it needs, and iterating over the items reads the catalog in order.
+    If the index does not match the catalog, it is rebuilt in memory.
+    """
+    def __init__(self):
+        self._offsets: dict[str, int] | None = None
+
+    def _get_offsets(self) -> dict[str, int]:
+        if self._offsets is None:
+            offsets: dict[str, int] = {}
+            try:
+                with open(_INDEX_PATH) as f:
+                    if int(f.readline()) == os.path.getsize(_CATALOG_PATH):
+                        for line in f:
+                            name, offset = line.split()
+                            offsets[name] = int(offset)
+            except (OSError, ValueError):
+                offsets = {}
+            if not offsets:
+                offsets = {name: offset for name, offset, _ in _scan_catalog()}
+            self._offsets = offsets
+        return self._offsets
+
+    def __getitem__(self, name: str) -> str:
+        offset = self._get_offsets()[name]
+        with open(_CATALOG_PATH, 'rb') as f:
+            f.seek(offset)
+            return f.readline().decode().split(',')[1]
+
+    def __contains__(self, name) -> bool:
+        return name in self._get_offsets()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_offsets())
+
+    def __len__(self) -> int:
+        return len(self._get_offsets())
+
+    def items(self) -> _CatalogItems:
+        return _CatalogItems(self)
+
 # Initialize pre-defined prime knot knot diagrams
-_knot_catalog: dict[str, str] = {}
-with open('unknotter/knotinfo.csv') as f:
-    for line in f.readlines():
-        parts = line.split(',')
-        name, raw_pd = parts[0], parts[1]
-        _knot_catalog[name] = raw_pd
+_knot_catalog: Mapping[str, str] = _Catalog()
 
 def _raw_pd_to_pd(raw_pd: str) -> PDNotation:
     str_ns = raw_pd.replace('[', '').replace(']', '').strip().split(';')
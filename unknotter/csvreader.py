@@ -1,14 +1,41 @@
+import sys
+from collections.abc import Container, Iterable, Iterator
+from itertools import islice
+from typing import TextIO
 from unknotter.catalog import _raw_pd_to_pd
-from unknotter.diagram import Diagram
+from unknotter.diagram import Diagram, PDNotation
 
-def read_to_list(filename: str, count: int = -1):
-    catalog: list[tuple[str, str]] = []
+def read_rows(filename: str, count: int = -1, labels: Container[str] | None = None) -> Iterator[tuple[str, PDNotation]]:
+    """Lazily read the rows (name, PD notation) of a dataset, one line at a time.
+
+    As with `read_to_list`, a nonnegative `count` skips the first line and reads
+    the `count` lines after it. If `labels` is given, only rows with a name in
+    `labels` are parsed and yielded.
+    """
     with open(filename) as f:
-        lines = f.readlines()[1:count+1] if count >= 0 else f.readlines()
+        lines = islice(f, 1, count + 1) if count >= 0 else f
         for line in lines:
             if line == '\n': continue
-            parts = line.split(',')
-            name, raw_pd = parts[0], parts[1]
-            catalog.append((name, _raw_pd_to_pd(raw_pd)))
-    return catalog
+            name, raw_pd = line.split(',', 2)[:2]
+            if labels is not None and name not in labels: continue
+            yield name, _raw_pd_to_pd(raw_pd)
+
+def read_chunks(filename: str, chunk_size: int, count: int = -1, labels: Container[str] | None = None) -> Iterator[list[tuple[str, PDNotation]]]:
+    """Lazily read the rows of a dataset in lists of at most `chunk_size` rows (see `read_rows`)."""
+    rows = read_rows(filename, count, labels)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
 
+def write_rows(rows: Iterable[Iterable[str]], file: TextIO | None = None, chunk_size: int = 1):
+    """Write each row of strings as one comma-separated line as soon as it is produced.
+
+    Rows are written to `file` (standard output if None) `chunk_size` lines at a time.
+    """
+    if file is None:
+        file = sys.stdout
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        file.write(''.join(','.join(row) + '\n' for row in chunk))
+
+def read_to_list(filename: str, count: int = -1):
+    return list(read_rows(filename, count))
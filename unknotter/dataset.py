@@ -0,0 +1,135 @@
+from __future__ import annotations
+import struct
+from collections.abc import Iterable, Iterator
+import numpy as np
+from unknotter.catalog import _raw_pd_to_pd
+from unknotter.csvreader import read_rows
+from unknotter.diagram import Diagram, PDNotation
+
+# A dataset file is laid out as:
+#   header: magic, version, row count, edge count, label count, and the byte
+#     offsets of the row offsets and label table (see `_HEADER`)
+#   data: every edge of every row as int32, row after row
+#   offsets: int64 index into the data where each row starts, plus the total
+#   labels: int32 index into the label table for each row
+#   label table: the label names as UTF-8, separated by newlines
+_MAGIC = b'UKPD'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIQQQQQ')
+
+class DatasetWriter:
+    """Write labeled PD notations to a binary dataset file one row at a time.
+
+    The edges are written as they arrive, and only the row offsets and labels
+    are kept in memory until the file is closed.
+    """
+    def __init__(self, filename: str):
+        self.file = open(filename, 'wb')
+        self.file.write(b'\0'*_HEADER.size)
+        self.offsets: list[int] = [0]
+        self.labels: list[int] = []
+        self.label_ids: dict[str, int] = {}
+
+    def write(self, name: str, pd_code: PDNotation | Diagram | str):
+        """Add one row. The PD notation may also be given in the plaintext form of the CSV datasets."""
+        if isinstance(pd_code, Diagram):
+            pd_code = pd_code.pd_code
+        elif isinstance(pd_code, str):
+            pd_code = _raw_pd_to_pd(pd_code)
+        edges = np.array(pd_code, dtype='<i4').reshape(-1)
+        self.file.write(edges.tobytes())
+        self.offsets.append(self.offsets[-1] + len(edges))
+        self.labels.append(self.label_ids.setdefault(name, len(self.label_ids)))
+
+    def close(self):
+        # Pad the data so the offsets are aligned.
+        self.file.write(b'\0'*(4*(self.offsets[-1] % 2)))
+        offsets_start = self.file.tell()
+        self.file.write(np.array(self.offsets, dtype='<i8').tobytes())
+        self.file.write(np.array(self.labels, dtype='<i4').tobytes())
+        labels_start = self.file.tell()
+        self.file.write('\n'.join(self.label_ids).encode())
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(self.labels), self.offsets[-1], len(self.label_ids),
+            offsets_start, labels_start))
+        self.file.close()
+
+    def __enter__(self) -> DatasetWriter:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def write_dataset(filename: str, rows: Iterable[tuple[str, PDNotation | Diagram | str]]):
+    """Write rows (name, PD notation), such as those of `generate_dataset` or `read_rows`, to a binary dataset file."""
+    with DatasetWriter(filename) as writer:
+        for name, pd_code in rows:
+            writer.write(name, pd_code)
+
+def csv_to_dataset(csv_filename: str, filename: str, count: int = -1):
+    """Convert a CSV dataset (see `read_rows`) into a binary dataset file."""
+    write_dataset(filename, read_rows(csv_filename, count))
+
+class Dataset:
+    """A binary dataset file of labeled PD notations, memory-mapped rather than read.
+
+    Attributes:
+        data: the edges of every row, one after another.
+        offsets: the index in `data` where each row starts, followed by the length of `data`.
+        labels: the index in `label_names` of each row's label.
+        label_names: the distinct labels in order of their first appearance.
+    """
+    def __init__(self, filename: str):
+        buffer = np.memmap(filename, dtype=np.uint8, mode='r')
+        magic, version, n_rows, n_edges, n_labels, offsets_start, labels_start = _HEADER.unpack(bytes(buffer[:_HEADER.size]))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{filename} is not a dataset file.")
+        self.data = np.frombuffer(buffer, dtype='<i4', count=n_edges, offset=_HEADER.size)
+        self.offsets = np.frombuffer(buffer, dtype='<i8', count=n_rows + 1, offset=offsets_start)
+        self.labels = np.frombuffer(buffer, dtype='<i4', count=n_rows, offset=offsets_start + 8*(n_rows + 1))
+        self.label_names: list[str] = bytes(buffer[labels_start:]).decode().split('\n') if n_labels else []
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, i: int) -> tuple[str, PDNotation]:
+        edges = self.edges(i).tolist()
+        return self.label_names[self.labels[i]], [tuple(edges[j:j + 4]) for j in range(0, len(edges), 4)]
+
+    def __iter__(self) -> Iterator[tuple[str, PDNotation]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def edges(self, i: int) -> np.ndarray:
+        """Get the edges of row `i` as a view of the file."""
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def matrix(self, crossing_count: int | None = None, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Get the rows `start` to `stop` as a matrix of their edges, padded with zeros to `crossing_count` crossings.
+
+        If every row has exactly `crossing_count` crossings, the matrix is a
+        read-only view of the file. By default the matrix fits the largest row.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = min(start, stop)
+        offsets = self.offsets[start:stop + 1]
+        lengths = np.diff(offsets)
+        width = int(lengths.max(initial=0)) if crossing_count is None else 4*crossing_count
+        if len(lengths) and lengths.max() > width:
+            raise ValueError(f"dataset has a diagram with more than {crossing_count} crossings.")
+
+        data = self.data[offsets[0]:offsets[-1]] if len(offsets) else self.data[:0]
+        if (lengths == width).all():
+            return data.reshape(len(lengths), width)
+
+        matrix = np.zeros((len(lengths), width), dtype=np.int32)
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        columns = np.arange(len(data)) - np.repeat(offsets[:-1] - offsets[0], lengths)
+        matrix[rows, columns] = data
+        return matrix
+
+    def chunks(self, chunk_size: int, crossing_count: int | None = None) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Iterate over the labels and padded matrices (see `matrix`) of `chunk_size` rows at a time."""
+        for start in range(0, len(self), chunk_size):
+            yield self.labels[start:start + chunk_size], self.matrix(crossing_count, start, start + chunk_size)
@@ -9,20 +9,85 @@ PDNotation = list[Crossing]
 class ReidemeisterError(Exception):
     pass
 
+def _least_rotation(sequence: list) -> int:
+    """Return the start index of the lexicographically least rotation of a sequence (Booth's algorithm)."""
+    doubled = sequence + sequence
+    failure = [-1] * len(doubled)
+    k = 0
+    for j in range(1, len(doubled)):
+        item = doubled[j]
+        i = failure[j - k - 1]
+        while i != -1 and item != doubled[k + i + 1]:
+            if item < doubled[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if i == -1 and item != doubled[k]:
+            if item < doubled[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return k
+
 class Diagram:
+    __slots__ = ('pd_code', '_canonical', '_incidence', '_faces')
+
     def __init__(self, pd_code):
         self.pd_code: PDNotation = pd_code
+        self._canonical: tuple | None = None
+        self._incidence: dict[Edge, list[tuple[int, int]]] | None = None
+        self._faces: FaceMap | None = None
     
     def __repr__(self) -> str:
         return f'Diagram({repr(self.pd_code)})'
     
-    def __eq__(self, other: Diagram) -> Diagram:
+    def __eq__(self, other: Diagram) -> bool:
         """Check if a diagram is equivalent to another considering orientation."""
+        if not isinstance(other, Diagram): return NotImplemented
+        if len(self.pd_code) != len(other.pd_code): return False
         if self.pd_code == other.pd_code: return True
-        for n in range(2*len(self.pd_code)):
-            if self.shift(n).identical(other):
-                return True
-        return False
+        return self.canonical() == other.canonical()
+
+    def __hash__(self) -> int:
+        return hash(self.canonical())
+
+    def canonical(self, up_to_symmetry: bool = False) -> tuple:
+        """Return a key that is equal for two diagrams if and only if they are equal.
+
+        Two diagrams are equal if one can be obtained from the other by shifting
+        its edge values (see `shift`) and reordering its crossings. Each crossing is
+        described relative to its incoming under-edge, which turns a shift of the
+        edges into a rotation of the sequence of these descriptions, so the key is
+        the least rotation of that sequence.
+
+        If `up_to_symmetry` is set, the key is additionally unchanged by
+        `transformations.reverse` and `transformations.reflect`.
+
+        Diagrams are treated as immutable, so the key is computed once and cached.
+        """
+        if up_to_symmetry:
+            from unknotter.transformations import reverse, reflect
+            # `reverse` and `reflect` do not commute; together they generate
+            # eight distinct relabelings of each crossing.
+            variants = [self]
+            for _ in range(3):
+                variants.append(reflect(variants[-1]))
+                variants.append(reverse(variants[-1]))
+            variants.append(reflect(variants[-1]))
+            return min(diagram.canonical() for diagram in variants)
+
+        if self._canonical is None:
+            n_edges = 2*len(self.pd_code)
+            if n_edges == 0:
+                self._canonical = (0, ())
+                return self._canonical
+            slots: list[list[tuple[int, int, int]]] = [[] for _ in range(n_edges)]
+            for a, b, c, d in self.pd_code:
+                slots[(a - 1) % n_edges].append(((b - a) % n_edges, (c - a) % n_edges, (d - a) % n_edges))
+            sequence = [tuple(sorted(slot)) for slot in slots]
+            start = _least_rotation(sequence)
+            self._canonical = (len(self.pd_code), tuple(sequence[start:] + sequence[:start]))
+        return self._canonical
     
     def _shiftmod(self, edge: Edge, n: int) -> Edge:
         """Shift an edge by a given amount, wrapping around the number of edges."""
@@ -37,9 +102,27 @@ class Diagram:
         if len(self.pd_code) != len(other.pd_code): return False
         return set(self.pd_code) == set(other.pd_code)
 
+    def _get_incidence(self) -> dict[Edge, list[tuple[int, int]]]:
+        """Get a table mapping each edge to the indices (crossing index, edge index) where it appears.
+
+        The table is built on first use and cached, since diagrams are treated as immutable.
+        Indices are listed in the order they appear in the PD notation.
+        """
+        if self._incidence is None:
+            incidence: dict[Edge, list[tuple[int, int]]] = {}
+            for crossing_index, crossing in enumerate(self.pd_code):
+                for edge_index, edge in enumerate(crossing):
+                    if edge in incidence:
+                        incidence[edge].append((crossing_index, edge_index))
+                    else:
+                        incidence[edge] = [(crossing_index, edge_index)]
+            self._incidence = incidence
+        return self._incidence
+
     def _get_crossings_with_edge(self, edge: Edge) -> list[Crossing]:
         """Get a list of all crossings that are adjacent to a given edge."""
-        return [crossing for crossing in self.pd_code if edge in crossing]
+        crossing_indices = dict.fromkeys(crossing_index for crossing_index, _ in self._get_incidence().get(edge, ()))
+        return [self.pd_code[crossing_index] for crossing_index in crossing_indices]
 
     def _next(self, edge: Edge) -> Edge:
         """Get the edge after a given edge (+1 with wraparound)."""
@@ -58,16 +141,8 @@ class Diagram:
         Thus, diagram._get_friend_index(1, 4) = (2, 3) and diagram._get_friend_index(2, 3) = (1, 4).
         """
         edge = self.pd_code[crossing_index][edge_index]
-        crossings_with_edge = self._get_crossings_with_edge(edge)
-        
-        if len(crossings_with_edge) == 1:
-            pos = [i for i, row in enumerate(self.pd_code[crossing_index]) if row == edge]
-            return (crossing_index, pos[1] if pos[0] == edge_index else pos[0])
-        
-        if crossings_with_edge[0] == self.pd_code[crossing_index]:
-            return (next(i for i, row in enumerate(self.pd_code) if row == crossings_with_edge[1]), next(i for i, x in enumerate(crossings_with_edge[1]) if x == edge))
-
-        return (next(i for i, row in enumerate(self.pd_code) if row == crossings_with_edge[0]), next(i for i, x in enumerate(crossings_with_edge[0]) if x == edge))
+        first, second = self._get_incidence()[edge]
+        return second if first == (crossing_index, edge_index) else first
 
     def _shift_unbounded(self, n: int) -> Diagram:
         """Return a diagram with all of its edge values shifted up by `n` without wrapping around.
@@ -90,15 +165,26 @@ class Diagram:
         Note: the edge index is never 2, since the edge would then be
         facing away from the crossing.
         """
-        for crossing_index, crossing in enumerate(self.pd_code):
-            if crossing[0] == edge:
+        for crossing_index, edge_index in self._get_incidence().get(edge, ()):
+            crossing = self.pd_code[crossing_index]
+            if edge_index == 0:
                 return crossing_index, 0
-            if crossing[1] == edge and crossing[3] == self._next(edge):
+            if edge_index == 1 and crossing[3] == self._next(edge):
                 return crossing_index, 1
-            if crossing[3] == edge and crossing[1] == self._next(edge):
+            if edge_index == 3 and crossing[1] == self._next(edge):
                 return crossing_index, 3
         raise NotImplementedError
 
+    def faces(self) -> FaceMap:
+        """Get the planar map of the diagram (see `FaceMap`).
+
+        The map is computed on first use and cached, so move enumeration and
+        move validation on the same diagram share a single computation.
+        """
+        if self._faces is None:
+            self._faces = FaceMap(self)
+        return self._faces
+
     def _get_adjacent_faces(self, edge: Edge) -> tuple[list[SignedEdge], list[SignedEdge]]:
         """Get the two faces adjacent to the given edge.
         
@@ -108,44 +194,27 @@ class Diagram:
         based on a specific direction, the edge is negative if it goes against the direction
         of the path we follow in generating the face.
         """
-        face_ccw: list[SignedEdge] = [edge]
-        face_cw: list[SignedEdge] = [edge]
-
-        # Generate the counterclockwise face.
-        crossing_index, edge_index = self._get_forth_index(edge)
-        edge_index = (edge_index - 1) % 4
-        while self.pd_code[crossing_index][edge_index] != edge:
-            sign = -1 if self._index_is_facing(crossing_index, edge_index) else 1
-            face_ccw.append(sign * self.pd_code[crossing_index][edge_index])
-            crossing_index, edge_index = self._get_friend_index(crossing_index, edge_index)
-            edge_index = (edge_index - 1) % 4
-        
-        # Generate the clockwise face.
-        crossing_index, edge_index = self._get_forth_index(edge)
-        edge_index = (edge_index + 1) % 4
-        while self.pd_code[crossing_index][edge_index] != edge:
-            sign = -1 if self._index_is_facing(crossing_index, edge_index) else 1
-            face_cw.append(sign * self.pd_code[crossing_index][edge_index])
-            crossing_index, edge_index = self._get_friend_index(crossing_index, edge_index)
-            edge_index = (edge_index + 1) % 4
-
-        return (face_ccw, face_cw)
+        return self.faces().adjacent(edge)
 
     def _is_closed(self, edge: Edge) -> bool:
         """Check if an edge on a diagram is closed.
         
         An edge is closed if, on both of the crossings it connects to, it crosses underneath.
         """
-        adj_crossings = [crossing for crossing in self.pd_code if edge in crossing]
-        return all(edge in [crossing[0], crossing[2]] for crossing in adj_crossings)
+        crosses_under: dict[int, bool] = {}
+        for crossing_index, edge_index in self._get_incidence().get(edge, ()):
+            crosses_under[crossing_index] = crosses_under.get(crossing_index, False) or edge_index % 2 == 0
+        return all(crosses_under.values())
 
     def _is_open(self, edge: Edge) -> bool:
         """Check if an edge on a diagram is open.
         
         An edge is open if, on both of the crossings it connects to, it crosses over.
         """
-        adj_crossings = [crossing for crossing in self.pd_code if edge in crossing]
-        return all(edge in [crossing[1], crossing[3]] for crossing in adj_crossings)
+        crosses_over: dict[int, bool] = {}
+        for crossing_index, edge_index in self._get_incidence().get(edge, ()):
+            crosses_over[crossing_index] = crosses_over.get(crossing_index, False) or edge_index % 2 == 1
+        return all(crosses_over.values())
 
     def _is_half_open(self, edge: Edge) -> bool:
         """Check if an edge on a diagram is half-open.
@@ -156,3 +225,86 @@ class Diagram:
 
     def _mathematica_format(self) -> str:
         return 'PD[' + ','.join(['X[' + ','.join([str(edge) for edge in crossing]) + ']' for crossing in self.pd_code]) + ']'
+
+class FaceMap:
+    """The faces of a diagram, computed in a single pass over its crossings.
+
+    Walking around a face counterclockwise, each time the walk reaches a crossing
+    it turns onto the previous edge of that crossing (the next edge when walking
+    clockwise) and follows it to its friend (see `Diagram._get_friend_index`).
+    Each walk is a cycle of indices (crossing index, edge index), and every index
+    lies on exactly one counterclockwise and one clockwise cycle, so all of the
+    cycles are found by visiting each index once.
+
+    Attributes:
+        faces: the boundary of each face as signed edges in counterclockwise order.
+        edge_faces: for each edge, the indices in `faces` of its counterclockwise and clockwise faces.
+        histogram: the number of faces of each size.
+    """
+    def __init__(self, diagram: Diagram):
+        self.diagram = diagram
+        pd_code = diagram.pd_code
+
+        # Each edge as it would be recorded by a face walk, signed by `Diagram._index_is_facing`.
+        self._signed: dict[tuple[int, int], SignedEdge] = {}
+        for crossing_index, crossing in enumerate(pd_code):
+            for edge_index, edge in enumerate(crossing):
+                sign = -1 if diagram._index_is_facing(crossing_index, edge_index) else 1
+                self._signed[crossing_index, edge_index] = sign * edge
+
+        self._ccw_cycles, self._ccw_position = self._find_cycles(-1)
+        self._cw_cycles, self._cw_position = self._find_cycles(1)
+
+        self.faces: list[list[SignedEdge]] = [
+            [self._signed[index] for index in cycle] for cycle in self._ccw_cycles]
+
+        self.edge_faces: dict[Edge, tuple[int, int]] = {}
+        for edge in range(1, 2*len(pd_code) + 1):
+            try:
+                crossing_index, edge_index = diagram._get_forth_index(edge)
+            except NotImplementedError:
+                continue
+            # The clockwise face of an edge is the counterclockwise cycle
+            # that turns from the next edge of its crossing onto it.
+            self.edge_faces[edge] = (
+                self._ccw_position[crossing_index, (edge_index - 1) % 4][0],
+                self._ccw_position[crossing_index, edge_index][0])
+
+        self.histogram: dict[int, int] = {}
+        for face in self.faces:
+            self.histogram[len(face)] = self.histogram.get(len(face), 0) + 1
+
+    def _find_cycles(self, turn: int) -> tuple[list[list[tuple[int, int]]], dict[tuple[int, int], tuple[int, int]]]:
+        """Find the face walk cycles turning by `turn` (-1 for counterclockwise, 1 for clockwise)."""
+        diagram = self.diagram
+        cycles: list[list[tuple[int, int]]] = []
+        position: dict[tuple[int, int], tuple[int, int]] = {}
+        for start in self._signed:
+            if start in position: continue
+            cycle: list[tuple[int, int]] = []
+            index = start
+            while index not in position:
+                position[index] = (len(cycles), len(cycle))
+                cycle.append(index)
+                crossing_index, edge_index = diagram._get_friend_index(*index)
+                index = (crossing_index, (edge_index + turn) % 4)
+            cycles.append(cycle)
+        return cycles, position
+
+    def adjacent(self, edge: Edge) -> tuple[list[SignedEdge], list[SignedEdge]]:
+        """Get the two faces adjacent to the given edge (see `Diagram._get_adjacent_faces`)."""
+        crossing_index, edge_index = self.diagram._get_forth_index(edge)
+        return (
+            self._walk(edge, self._ccw_cycles, self._ccw_position[crossing_index, (edge_index - 1) % 4]),
+            self._walk(edge, self._cw_cycles, self._cw_position[crossing_index, (edge_index + 1) % 4]))
+
+    def _walk(self, edge: Edge, cycles: list[list[tuple[int, int]]], position: tuple[int, int]) -> list[SignedEdge]:
+        """Read a face from the given position of a cycle, starting at `edge` and stopping when it returns to it."""
+        cycle_index, start = position
+        cycle = cycles[cycle_index]
+        face: list[SignedEdge] = [edge]
+        for i in range(len(cycle)):
+            signed_edge = self._signed[cycle[(start + i) % len(cycle)]]
+            if abs(signed_edge) == edge: break
+            face.append(signed_edge)
+        return face
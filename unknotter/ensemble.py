@@ -0,0 +1,239 @@
+from __future__ import annotations
+import math
+import numpy as np
+from unknotter.diagram import *
+from unknotter.reidemeister import left_positive_twist, left_negative_twist, right_positive_twist, right_negative_twist, poke
+
+# The crossing added by each twist, as offsets from the twisted edge
+# (see `left_positive_twist` and the other twists).
+_TWIST_CROSSINGS = np.array([
+    (0, 2, 1, 1),
+    (1, 0, 2, 1),
+    (1, 1, 2, 0),
+    (0, 1, 1, 2),
+], dtype=np.int32)
+_TWISTS = [left_positive_twist, left_negative_twist, right_positive_twist, right_negative_twist]
+
+# The two crossings added by a poke, as offsets from the lower and higher edges,
+# indexed by [sign of the higher edge is negative][face is counterclockwise][lower edge is under].
+# Each offset is (0 for lower or 1 for higher, amount added). See `poke`.
+_POKE_CROSSINGS = np.array([
+    [   # higher_edge in face
+        [   # face_cw
+            [[(1, 2), (0, 2), (1, 3), (0, 1)], [(1, 3), (0, 0), (1, 4), (0, 1)]],
+            [[(0, 0), (1, 4), (0, 1), (1, 3)], [(0, 1), (1, 2), (0, 2), (1, 3)]],
+        ],
+        [   # face_ccw
+            [[(1, 2), (0, 1), (1, 3), (0, 2)], [(1, 3), (0, 1), (1, 4), (0, 0)]],
+            [[(0, 0), (1, 3), (0, 1), (1, 4)], [(0, 1), (1, 3), (0, 2), (1, 2)]],
+        ],
+    ],
+    [   # -higher_edge in face
+        [   # face_cw
+            [[(1, 2), (0, 1), (1, 3), (0, 0)], [(1, 3), (0, 1), (1, 4), (0, 2)]],
+            [[(0, 0), (1, 2), (0, 1), (1, 3)], [(0, 1), (1, 4), (0, 2), (1, 3)]],
+        ],
+        [   # face_ccw
+            [[(1, 2), (0, 0), (1, 3), (0, 1)], [(1, 3), (0, 2), (1, 4), (0, 1)]],
+            [[(0, 0), (1, 3), (0, 1), (1, 2)], [(0, 1), (1, 3), (0, 2), (1, 4)]],
+        ],
+    ],
+], dtype=np.int32)
+
+class Ensemble:
+    """A batch of diagrams grown together by random twists and pokes.
+
+    The diagrams are held in one padded array of shape (batch size, capacity, 4),
+    where the rows past each diagram's crossing count are zero. Every call to
+    `step` picks a move for each diagram that has not yet reached its target
+    crossing count and applies all of them at once with array operations.
+
+    Pokes are chosen by picking a corner of a random crossing, so the two edges
+    always share a face. A poke that `poke` does not support (an edge appearing
+    twice in one crossing, or the two edges of a corner being the same) leaves
+    the diagram unchanged for that step.
+
+    Attributes:
+        codes: the padded PD notation of every diagram.
+        sizes: the number of crossings of every diagram.
+        targets: the crossing count each diagram grows to.
+    """
+    def __init__(self, diagrams: list[Diagram], targets: int | list[int], beta: float = 0, rng: np.random.Generator | None = None):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.beta = beta
+        self.sizes = np.array([len(diagram.pd_code) for diagram in diagrams], dtype=np.int32)
+        self.targets = np.broadcast_to(np.asarray(targets, dtype=np.int32), self.sizes.shape).copy()
+        # A poke adds two crossings, so a diagram can end one past its target.
+        capacity = int(max(self.targets.max(initial=0) + 1, self.sizes.max(initial=0)))
+        self.codes = np.zeros((len(diagrams), capacity, 4), dtype=np.int32)
+        for i, diagram in enumerate(diagrams):
+            self.codes[i, :self.sizes[i]] = list(diagram.pd_code)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def diagram(self, i: int) -> Diagram:
+        """Get the diagram at index `i`."""
+        return Diagram([tuple(int(edge) for edge in crossing) for crossing in self.codes[i, :self.sizes[i]]])
+
+    def diagrams(self) -> list[Diagram]:
+        """Get every diagram in the ensemble."""
+        return [self.diagram(i) for i in range(len(self))]
+
+    def active(self) -> np.ndarray:
+        """Get the mask of diagrams that have not yet reached their target crossing count."""
+        return self.sizes < self.targets
+
+    def run(self) -> list[Diagram]:
+        """Step until every diagram reaches its target crossing count and return the diagrams."""
+        while self.active().any():
+            self.step()
+        return self.diagrams()
+
+    def step(self) -> np.ndarray:
+        """Apply one random move to every active diagram.
+
+        Returns the mask of diagrams that changed.
+        """
+        active = self.active()
+        twist_weight = math.e**-self.beta
+        poke_weight = math.e**(-2*self.beta)
+        twisting = self.rng.random(len(self)) < twist_weight / (twist_weight + poke_weight)
+
+        # Infinity unknots are special cases of every move, so they use the scalar moves.
+        small = active & (self.sizes <= 1)
+        for i in np.flatnonzero(small):
+            self._apply_scalar(i, bool(twisting[i]))
+
+        changed = small.copy()
+        twists = np.flatnonzero(active & ~small & twisting)
+        pokes = np.flatnonzero(active & ~small & ~twisting)
+        if len(twists):
+            n_edges = 2*self.sizes[twists]
+            edges = (self.rng.random(len(twists))*n_edges).astype(np.int32) + 1
+            self._twist(twists, edges, self.rng.integers(4, size=len(twists)))
+            changed[twists] = True
+        if len(pokes):
+            sizes = self.sizes[pokes]
+            changed[pokes] = self._poke(
+                pokes,
+                (self.rng.random(len(pokes))*sizes).astype(np.int32),
+                self.rng.integers(4, size=len(pokes)),
+                self.rng.integers(2, size=len(pokes)).astype(bool))
+        return changed
+
+    def _apply_scalar(self, i: int, twisting: bool):
+        """Apply a random twist or poke to the diagram at index `i` with the scalar moves."""
+        diagram = self.diagram(i)
+        n_edges = 2*len(diagram.pd_code)
+        if twisting:
+            twist = _TWISTS[self.rng.integers(4)]
+            diagram = twist(diagram, int(self.rng.integers(n_edges)) + 1)
+        else:
+            under_edge = int(self.rng.integers(n_edges)) + 1
+            diagram = poke(diagram, under_edge, under_edge % n_edges + 1)
+        self.sizes[i] = len(diagram.pd_code)
+        self.codes[i, :self.sizes[i]] = diagram.pd_code
+
+    def _twist(self, rows: np.ndarray, edges: np.ndarray, kinds: np.ndarray):
+        """Twist the given edge of each of the given diagrams (see `reidemeister._prepare_twist`).
+
+        Each kind indexes `_TWISTS`.
+        """
+        sizes = self.sizes[rows]
+        n_edges = 2*sizes
+
+        # The twists rotate the labels so the twisted edge is neither the first nor the last.
+        shifts = np.where(edges == 1, 1, np.where(edges == n_edges, 2, 0))
+        edges = np.where(shifts > 0, 2, edges)
+
+        codes = self.codes[rows]
+        valid = np.arange(codes.shape[1])[None, :] < sizes[:, None]
+        modulus = n_edges[:, None, None]
+        codes = np.where(valid[..., None], (codes + shifts[:, None, None] - 1) % modulus + 1, 0)
+
+        target = edges[:, None, None]
+        previous_in_crossing = (codes == target - 1).any(axis=2, keepdims=True)
+        new_codes = np.where(
+            (codes < target) | (codes == target) & previous_in_crossing,
+            codes, codes + 2)
+
+        # Crossings with the twisted edge twice keep two edges and add two to the other two.
+        on_twist = (codes == target).sum(axis=2) == 2
+        if on_twist.any():
+            c0 = codes[..., 0]
+            c1 = codes[..., 1]
+            following = c0 % n_edges[:, None] + 1
+            ordered = (following == c1) | (following % n_edges[:, None] + 1 == c1)
+            offsets = np.where(ordered[..., None], (0, 2, 0, 2), (2, 0, 2, 0))
+            new_codes = np.where(on_twist[..., None], codes + offsets, new_codes)
+
+        new_codes = np.where(valid[..., None], new_codes, 0)
+        new_codes[np.arange(len(rows)), sizes] = edges[:, None] + _TWIST_CROSSINGS[kinds]
+        self.codes[rows] = new_codes
+        self.sizes[rows] = sizes + 1
+
+    def _poke(self, rows: np.ndarray, crossing_indices: np.ndarray, corners: np.ndarray, lower_is_under: np.ndarray) -> np.ndarray:
+        """Poke the two edges at a corner of a crossing in each of the given diagrams (see `poke`).
+
+        Corner `i` lies between edge indices `i` and `i - 1` of its crossing.
+        Returns the mask over `rows` of the diagrams that were poked.
+        """
+        sizes = self.sizes[rows]
+        n_edges = 2*sizes
+
+        codes = self.codes[rows]
+        batch = np.arange(len(rows))
+        crossings = codes[batch, crossing_indices]
+        # Walking counterclockwise around a face, a walk arrives on `first`
+        # and turns onto `second`, the previous edge of the same crossing.
+        first = crossings[batch, corners]
+        second = crossings[batch, (corners - 1) % 4]
+        first_in = _is_facing(crossings, corners, n_edges)
+        second_in = _is_facing(crossings, (corners - 1) % 4, n_edges)
+
+        # Find the face of the lower edge that the corner lies on and the sign of
+        # the higher edge on it, as `poke` reads them from `Diagram._get_adjacent_faces`.
+        first_lower = first < second
+        lower = np.minimum(first, second)
+        higher = np.maximum(first, second)
+        face_ccw = np.where(first_lower, first_in, ~second_in)
+        higher_negative = np.where(first_lower, second_in == first_in, first_in == second_in)
+
+        valid = np.arange(codes.shape[1])[None, :] < sizes[:, None]
+        lower_count = (codes == lower[:, None, None]).sum(axis=2)
+        higher_count = (codes == higher[:, None, None]).sum(axis=2)
+        ok = (first != second) & (lower_count < 2).all(axis=1) & (higher_count < 2).all(axis=1)
+
+        # Relabel the edges like `reidemeister._prepare_poke`.
+        low = lower[:, None, None]
+        high = higher[:, None, None]
+        modulus = n_edges[:, None, None]
+        has_prev_lower = (codes == (low - 2) % modulus + 1).any(axis=2, keepdims=True)
+        has_prev_higher = (codes == (high - 2) % modulus + 1).any(axis=2, keepdims=True)
+        new_codes = np.where(
+            (codes < low) | (codes == low) & has_prev_lower, codes,
+            np.where(
+                (codes <= low) | (codes < high) | (codes == high) & has_prev_higher, codes + 2,
+                codes + 4))
+        new_codes = np.where(valid[..., None], new_codes, 0)
+
+        layout = _POKE_CROSSINGS[higher_negative.astype(int), face_ccw.astype(int), lower_is_under.astype(int)]
+        bases = np.where(layout[..., 0] == 0, lower[:, None, None], higher[:, None, None])
+        added = bases + layout[..., 1]
+        new_codes[batch, sizes] = added[:, 0]
+        new_codes[batch, sizes + 1] = added[:, 1]
+
+        poked = rows[ok]
+        self.codes[poked] = new_codes[ok]
+        self.sizes[poked] = sizes[ok] + 2
+        return ok
+
+def _is_facing(crossings: np.ndarray, edge_indices: np.ndarray, n_edges: np.ndarray) -> np.ndarray:
+    """Vectorized `Diagram._index_is_facing` over one crossing per diagram."""
+    c1 = crossings[:, 1]
+    c3 = crossings[:, 3]
+    return np.select(
+        [edge_indices == 0, edge_indices == 1, edge_indices == 3],
+        [True, c3 == c1 % n_edges + 1, c1 == c3 % n_edges + 1],
+        False)
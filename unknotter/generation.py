@@ -0,0 +1,138 @@
+from __future__ import annotations
+import random
+from collections.abc import Iterator
+from unknotter.diagram import *
+from unknotter.properties import get_plaintext_code
+from unknotter.walker import RandomWalker
+
+def random_diagram(self: Diagram, crossing_count: int, rng: random.Random = random) -> Diagram:
+    """Randomly walk `self` with the beta 0 walk until it has at least `crossing_count` crossings."""
+    walker = RandomWalker(self, 0, rng)
+    while len(walker.diagram.pd_code) < crossing_count:
+        walker.step()
+    return walker.diagram
+
+def _generate_chunk(knots: list[tuple[str, PDNotation]], crossing_count: int, seed: int, start: int, stop: int) -> list[list[str]]:
+    """Generate the rows `start` to `stop` of a dataset.
+
+    Each chunk draws from its own random stream derived from the seed and its
+    first row, so a chunk is the same no matter which worker generates it.
+    """
+    rng = random.Random(f'{seed}:{start}')
+    rows: list[list[str]] = []
+    for i in range(start, stop):
+        name, pd_code = knots[i % len(knots)]
+        rows.append([name, get_plaintext_code(random_diagram(Diagram(pd_code), crossing_count, rng))])
+    return rows
+
+def generate_dataset(knots: list[tuple[str, Diagram]], crossing_count: int, data_size: int, seed: int | None = None, workers: int | None = 1, chunk_size: int = 500) -> Iterator[list[str]]:
+    """Generate the rows [name, PD notation] of a dataset of `data_size` random diagrams.
+
+    Row `i` is a random diagram of the knot `knots[i % len(knots)]` with at least
+    `crossing_count` crossings. The rows are split into chunks of `chunk_size`
+    which are generated across `workers` processes (all available cores if None)
+    and yielded in order. The rows only depend on `seed` and `chunk_size`, so the
+    same seed gives the same dataset with any number of workers.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    knot_codes = [(name, list(diagram.pd_code)) for name, diagram in knots]
+    bounds = [(start, min(start + chunk_size, data_size)) for start in range(0, data_size, chunk_size)]
+
+    if not bounds:
+        return
+    if workers == 1:
+        for start, stop in bounds:
+            yield from _generate_chunk(knot_codes, crossing_count, seed, start, stop)
+        return
+
+    # Imported here since it is slow to import and only needed with multiple workers.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        chunks = executor.map(
+            _generate_chunk,
+            *zip(*((knot_codes, crossing_count, seed, start, stop) for start, stop in bounds)))
+        for rows in chunks:
+            yield from rows
+
+def harvest(self: Diagram, crossing_counts: list[int], quota: int, interval: int = 10, width: int = 2, rng: random.Random = random) -> dict[int, list[Diagram]]:
+    """Sample `quota` random diagrams of `self` for every size bucket from the same long walks.
+
+    The bucket of a crossing count s holds diagrams with s to s + `width` - 1
+    crossings. The beta 0 walk of `random_diagram` passes through every bucket
+    on its way up, so rather than walking from `self` once per diagram, a walk
+    is sampled whenever it is in a bucket that still needs diagrams and has
+    gone at least `interval` moves since that bucket last took one of its
+    diagrams. Once a walk grows past every bucket that still needs diagrams,
+    a new walk starts from `self`.
+    """
+    if any(count + width <= len(self.pd_code) for count in crossing_counts):
+        raise ValueError(f"cannot harvest diagrams with fewer crossings than the {len(self.pd_code)} of the starting diagram.")
+    buckets: dict[int, list[Diagram]] = {count: [] for count in crossing_counts}
+    last_sample = {count: -interval for count in crossing_counts}
+    walker = RandomWalker(self, 0, rng)
+    moves = 0
+    while True:
+        needed = [count for count, diagrams in buckets.items() if len(diagrams) < quota]
+        if not needed: return buckets
+        crossings = len(walker.diagram.pd_code)
+        for count in needed:
+            if count <= crossings < count + width and moves - last_sample[count] >= interval:
+                buckets[count].append(walker.diagram)
+                last_sample[count] = moves
+        if crossings >= max(needed) + width:
+            walker = RandomWalker(self, 0, rng)
+        else:
+            walker.step()
+        moves += 1
+
+def _harvest_chunk(knots: list[tuple[str, PDNotation]], crossing_counts: list[int], seed: int, start: int, stop: int, interval: int, width: int) -> dict[int, list[list[str]]]:
+    """Harvest the rows `start` to `stop` of every bucket of a dataset (see `_generate_chunk`)."""
+    rng = random.Random(f'{seed}:{start}')
+    # Row `i` of every bucket is a diagram of knot `i % len(knots)`.
+    harvests = []
+    for k, (_, pd_code) in enumerate(knots):
+        quota = len(range(start + (k - start) % len(knots), stop, len(knots)))
+        harvests.append(harvest(Diagram(pd_code), crossing_counts, quota, interval, width, rng) if quota else None)
+    rows: dict[int, list[list[str]]] = {count: [] for count in crossing_counts}
+    taken = [0]*len(knots)
+    for i in range(start, stop):
+        k = i % len(knots)
+        for count in crossing_counts:
+            rows[count].append([knots[k][0], get_plaintext_code(harvests[k][count][taken[k]])])
+        taken[k] += 1
+    return rows
+
+def harvest_dataset(knots: list[tuple[str, Diagram]], crossing_counts: list[int], data_size: int, seed: int | None = None, workers: int | None = 1,
+                    chunk_size: int = 500, interval: int = 10, width: int = 2) -> Iterator[tuple[int, list[str]]]:
+    """Generate a dataset like `generate_dataset` for every crossing count at once with `harvest`.
+
+    Yields pairs of a crossing count and a row [name, PD notation], with
+    `data_size` rows for each crossing count. Row `i` of each crossing count is a
+    diagram of `knots[i % len(knots)]` with that many crossings up to
+    `width` - 1 more. Chunks are generated and yielded in order as in
+    `generate_dataset`, so the rows only depend on `seed` and `chunk_size`.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    knot_codes = [(name, list(diagram.pd_code)) for name, diagram in knots]
+    arguments = [
+        (knot_codes, list(crossing_counts), seed, start, min(start + chunk_size, data_size), interval, width)
+        for start in range(0, data_size, chunk_size)]
+    if not arguments:
+        return
+    if workers == 1:
+        chunks = (_harvest_chunk(*args) for args in arguments)
+        for rows in chunks:
+            for count, count_rows in rows.items():
+                for row in count_rows:
+                    yield count, row
+        return
+
+    # Imported here since it is slow to import and only needed with multiple workers.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        for rows in executor.map(_harvest_chunk, *zip(*arguments)):
+            for count, count_rows in rows.items():
+                for row in count_rows:
+                    yield count, row
@@ -0,0 +1,53 @@
+import gzip
+import os
+from unknotter.catalog import _knot_catalog, _raw_pd_to_pd
+from unknotter.diagram import *
+from unknotter.properties import jones
+
+# Rebuild with `identification._write_jones_index()` after editing knotinfo.csv.
+_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'knotinfo.jones.gz')
+
+def _jones_key(polynomial: LaurentPolynomial) -> str:
+    """Write a Jones polynomial compactly as its lowest exponent, denominator and coefficients."""
+    return f'{polynomial.offset}/{polynomial.denominator}:' + ','.join(map(str, polynomial.coefficient_list))
+
+def _crossing_number(name: str) -> int:
+    """Get the crossing number from the name of a catalog knot, such as 3_1 or 11a_1."""
+    return int(name.split('_')[0].rstrip('an'))
+
+def _write_jones_index(path: str = _INDEX_PATH):
+    """Write the index of the catalog by Jones polynomial, one line per polynomial followed by the names of its knots."""
+    index: dict[str, list[str]] = {}
+    for name, raw_pd in _knot_catalog.items():
+        index.setdefault(_jones_key(jones(Diagram(_raw_pd_to_pd(raw_pd)))), []).append(name)
+    lines = ''.join(f'{key} {" ".join(names)}\n' for key, names in index.items())
+    # Leave out the modification time so the file only changes with the catalog.
+    with open(path, 'wb') as f, gzip.GzipFile(filename='', fileobj=f, mode='wb', mtime=0) as compressed:
+        compressed.write(lines.encode())
+
+_jones_index: dict[str, list[str]] | None = None
+
+def _get_jones_index() -> dict[str, list[str]]:
+    global _jones_index
+    if _jones_index is None:
+        _jones_index = {}
+        with gzip.open(_INDEX_PATH, 'rt') as f:
+            for line in f:
+                key, *names = line.split()
+                _jones_index[key] = names
+    return _jones_index
+
+def identify(self: Diagram) -> list[str]:
+    """Return the names of the catalog knots that may be the knot of a diagram.
+
+    The candidates are the knots whose Jones polynomial is that of the diagram or
+    of its mirror image (the catalog only lists one of each mirror pair), with a
+    crossing number no more than the number of crossings in the diagram. The
+    Jones polynomial also fixes the determinant, |V(-1)|. A knot not in the
+    catalog may share its Jones polynomial with one that is, so the diagram is
+    only certainly not any knot missing from the list.
+    """
+    index = _get_jones_index()
+    polynomial = jones(self)
+    names = index.get(_jones_key(polynomial), []) + index.get(_jones_key(polynomial.inverted()), [])
+    return [name for name in dict.fromkeys(names) if _crossing_number(name) <= len(self.pd_code)]
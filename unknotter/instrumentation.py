@@ -0,0 +1,112 @@
+from __future__ import annotations
+import functools
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from unknotter.diagram import ReidemeisterError
+
+class WalkStats:
+    """Statistics recorded by the instrumented functions while instrumentation is on (see `instrument`).
+
+    Times are inclusive, so the time of a move applied through `RandomWalker.apply`
+    is also part of the time of `apply`.
+
+    Attributes:
+        calls: the number of calls of each instrumented function.
+        time: the total time in seconds spent in each instrumented function.
+        rejections: the number of calls of each function that raised `NotImplementedError`
+            or `ReidemeisterError`, which random walks retry.
+        category_time: the total time in seconds spent in each category of function
+            ('move', 'enumerate', 'update' or 'invariant').
+        sizes: the number of moves applied to diagrams of each crossing count.
+        events: each call as (name, category, start, duration) if tracing, for `dump_chrome_trace`.
+    """
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.calls: dict[str, int] = {}
+        self.time: dict[str, float] = {}
+        self.rejections: dict[str, int] = {}
+        self.category_time: dict[str, float] = {}
+        self.sizes: dict[int, int] = {}
+        self.events: list[tuple[str, str, float, float]] = []
+        self._running: set[str] = set()
+        self._start = perf_counter()
+
+    def record(self, name: str, category: str, start: float, duration: float, rejected: bool):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.time[name] = self.time.get(name, 0) + duration
+        self.category_time[category] = self.category_time.get(category, 0) + duration
+        if rejected:
+            self.rejections[name] = self.rejections.get(name, 0) + 1
+        if self.trace:
+            self.events.append((name, category, start - self._start, duration))
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'time': self.time,
+            'rejections': self.rejections,
+            'category_time': self.category_time,
+            'sizes': {str(size): count for size, count in sorted(self.sizes.items())},
+        }
+
+    def dump_json(self, filename: str):
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def dump_chrome_trace(self, filename: str):
+        """Write the traced calls in the Chrome trace event format (for chrome://tracing or Perfetto)."""
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': [
+                {'name': name, 'cat': category, 'ph': 'X', 'ts': 1e6*start, 'dur': 1e6*duration, 'pid': 0, 'tid': 0}
+                for name, category, start, duration in self.events]}, f)
+
+# The statistics being recorded, or None if instrumentation is off.
+_active: WalkStats | None = None
+
+@contextmanager
+def instrument(trace: bool = False) -> Iterator[WalkStats]:
+    """Record statistics of the instrumented functions within a `with` block.
+
+    The statistics are yielded as a `WalkStats`. With `trace`, every call is
+    also kept for `WalkStats.dump_chrome_trace`.
+    """
+    global _active
+    previous = _active
+    _active = WalkStats(trace)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+def instrumented(category: str):
+    """Decorate a function so its calls are recorded while instrumentation is on.
+
+    When instrumentation is off, this only adds a check of `_active` to each call.
+    Recursive calls (such as a twist on a shifted diagram) are recorded once.
+    """
+    def decorator(function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stats = _active
+            if stats is None or name in stats._running:
+                return function(*args, **kwargs)
+            if category == 'move':
+                size = len(args[0].pd_code)
+                stats.sizes[size] = stats.sizes.get(size, 0) + 1
+            stats._running.add(name)
+            rejected = False
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except (NotImplementedError, ReidemeisterError):
+                rejected = True
+                raise
+            finally:
+                stats.record(name, category, start, perf_counter() - start, rejected)
+                stats._running.discard(name)
+        return wrapper
+    return decorator
@@ -0,0 +1,169 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Sequence
+from unknotter.diagram import *
+
+class _CrossingView(Sequence):
+    """A read-only view of a flat buffer of edges as a list of crossings.
+
+    This lets every function that reads `Diagram.pd_code` work on a
+    `PackedDiagram` without building the whole list of tuples.
+    """
+    __slots__ = ('buffer',)
+
+    def __init__(self, buffer: array):
+        self.buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.buffer) // 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("crossing index out of range")
+        return tuple(self.buffer[4*index:4*index + 4])
+
+    def __iter__(self):
+        buffer = self.buffer
+        for i in range(0, len(buffer), 4):
+            yield tuple(buffer[i:i + 4])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _CrossingView):
+            return self.buffer == other.buffer
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+class PackedDiagram(Diagram):
+    """A diagram whose crossings are stored in one flat buffer of 32-bit integers.
+
+    `pd_code` is a view over the buffer, so all of the functions written for
+    `Diagram` accept a `PackedDiagram`. The Reidemeister moves recognize it and
+    relabel edges directly on the buffer, returning another `PackedDiagram`.
+    """
+    __slots__ = ('buffer',)
+
+    def __init__(self, pd_code: PDNotation | array = ()):
+        if isinstance(pd_code, array):
+            self.buffer = pd_code
+        else:
+            self.buffer = array('i', [edge for crossing in pd_code for edge in crossing])
+        self._canonical = None
+        self._incidence = None
+        self._faces = None
+
+    @property
+    def pd_code(self) -> _CrossingView:
+        return _CrossingView(self.buffer)
+
+    def __repr__(self) -> str:
+        return f'PackedDiagram({repr(list(self.pd_code))})'
+
+    def to_diagram(self) -> Diagram:
+        return Diagram(list(self.pd_code))
+
+    def _n_edges(self) -> int:
+        return len(self.buffer) // 2
+
+    def _shiftmod(self, edge: Edge, n: int) -> Edge:
+        return (edge + n - 1) % self._n_edges() + 1
+
+    def shift(self, n: int) -> PackedDiagram:
+        """Return a diagram with all of its edge values shifted up by `n`."""
+        n_edges = self._n_edges()
+        return PackedDiagram(array('i', [(edge + n - 1) % n_edges + 1 for edge in self.buffer]))
+
+    def _shift_unbounded(self, n: int) -> PackedDiagram:
+        return PackedDiagram(array('i', [edge + n for edge in self.buffer]))
+
+    def _positions(self, edge: Edge) -> list[int]:
+        """Get the indices in the buffer where `edge` appears."""
+        if self._incidence is not None:
+            return [4*crossing_index + edge_index for crossing_index, edge_index in self._incidence.get(edge, ())]
+        positions = []
+        position = -1
+        try:
+            while True:
+                position = self.buffer.index(edge, position + 1)
+                positions.append(position)
+        except ValueError:
+            return positions
+
+    def _crossing_has(self, position: int, edge: Edge) -> bool:
+        """Check if the crossing containing the given buffer index also contains `edge`."""
+        start = position - position % 4
+        return edge in self.buffer[start:start + 4]
+
+def _prepare_twist_buffer(self: PackedDiagram, target_edge: Edge) -> array:
+    """Relabel the buffer of `self` like `reidemeister._prepare_twist`."""
+    buffer = self.buffer
+    new_buffer = array('i', [edge + 2 if edge > target_edge else edge for edge in buffer])
+    previous = self._prev(target_edge)
+    for position in self._positions(target_edge):
+        start = position - position % 4
+        crossing = buffer[start:start + 4]
+        if crossing.count(target_edge) == 2:
+            # The target edge lies on a twist.
+            c0, c1, c2, c3 = crossing
+            if self._next(c0) == c1 or self._next(self._next(c0)) == c1:
+                new_buffer[start:start + 4] = array('i', (c0, c1 + 2, c2, c3 + 2))
+            else:
+                new_buffer[start:start + 4] = array('i', (c0 + 2, c1, c2 + 2, c3))
+        elif previous not in crossing:
+            new_buffer[position] = target_edge + 2
+    return new_buffer
+
+def _prepare_poke_buffer(self: PackedDiagram, lower_edge: Edge, higher_edge: Edge) -> array:
+    """Relabel the buffer of `self` like `reidemeister._prepare_poke`."""
+    buffer = self.buffer
+    lower_positions = self._positions(lower_edge)
+    higher_positions = self._positions(higher_edge)
+    for positions in (lower_positions, higher_positions):
+        if len({position // 4 for position in positions}) < len(positions):
+            raise NotImplementedError
+    new_buffer = array('i', [
+        edge if edge < lower_edge else edge + 2 if edge < higher_edge else edge + 4
+        for edge in buffer])
+    for position in lower_positions:
+        new_buffer[position] = lower_edge if self._crossing_has(position, self._prev(lower_edge)) else lower_edge + 2
+    for position in higher_positions:
+        new_buffer[position] = higher_edge + 2 if self._crossing_has(position, self._prev(higher_edge)) else higher_edge + 4
+    return new_buffer
+
+def _untwist_buffer(self: PackedDiagram, edge: Edge) -> PackedDiagram:
+    """Remove the twist at `edge` like `reidemeister.untwist`, relabeling the buffer."""
+    crossing_indices = [position // 4 for position in self._positions(edge)]
+    twisted = [i for i in crossing_indices if crossing_indices.count(i) == 2]
+    if not twisted:
+        raise ReidemeisterError("given edge is not on a twist, so it cannot be untwisted.")
+    start = 4*min(twisted)
+    buffer = self.buffer
+    return PackedDiagram(array('i', [
+        x - 2 if x > edge else x
+        for x in buffer[:start] + buffer[start + 4:]]))
+
+def _unpoke_buffer(self: PackedDiagram, edge1: Edge, edge2: Edge) -> PackedDiagram:
+    """Remove the poke between two edges like `reidemeister.unpoke`, relabeling the buffer."""
+    buffer = self.buffer
+    kept = array('i')
+    deleted_crossings = 0
+    for start in range(0, len(buffer), 4):
+        crossing = buffer[start:start + 4]
+        if edge1 in crossing and edge2 in crossing:
+            deleted_crossings += 1
+        else:
+            kept.extend(crossing)
+    if deleted_crossings != 2:
+        raise ReidemeisterError("given edge is not on a poke, so it cannot be unpoked.")
+    lower_edge = min(edge1, edge2)
+    higher_edge = max(edge1, edge2)
+    return PackedDiagram(array('i', [
+        e - 4 if e > higher_edge else e if e < lower_edge else e - 2
+        for e in kept]))
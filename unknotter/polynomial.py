@@ -1,4 +1,6 @@
 from __future__ import annotations
+from fractions import Fraction
+from math import gcd, lcm
 
 class Polynomial:
     def __init__(self, coefficients: dict[tuple[int, ...], int] | dict[int, int], fallback_n_vars: int = 0):
@@ -120,3 +122,237 @@ class Polynomial:
     def one(n_vars: int = 1) -> Polynomial:
         return Polynomial({(0,)*n_vars: 1})
 
+
+class LaurentPolynomial:
+    """A single-variable Laurent polynomial with a dense list of integer coefficients.
+
+    The coefficient at index `i` belongs to the term with exponent
+    `(offset + i) / denominator`, so quarter powers such as those of the Jones
+    polynomial in terms of A are kept exact. Leading and trailing zeros are
+    always stripped, and the denominator is kept as small as possible.
+    """
+    n_vars = 1
+
+    def __init__(self, coefficient_list: list[int], offset: int = 0, denominator: int = 1):
+        if denominator < 1:
+            raise ValueError("the exponent denominator must be a positive integer.")
+        self.coefficient_list = list(coefficient_list)
+        self.offset = offset
+        self.denominator = denominator
+        self._normalize()
+
+    def _normalize(self):
+        coefficient_list = self.coefficient_list
+        while coefficient_list and coefficient_list[-1] == 0:
+            coefficient_list.pop()
+        start = 0
+        while start < len(coefficient_list) and coefficient_list[start] == 0:
+            start += 1
+        if start == len(coefficient_list):
+            self.coefficient_list, self.offset, self.denominator = [], 0, 1
+            return
+        if start:
+            del coefficient_list[:start]
+            self.offset += start
+        if self.denominator == 1: return
+        # Reduce the denominator by the gcd of all exponents with nonzero terms.
+        g = gcd(self.denominator, self.offset)
+        for i, coefficient in enumerate(coefficient_list):
+            if g == 1: return
+            if coefficient != 0:
+                g = gcd(g, i)
+        if g > 1:
+            self.coefficient_list = coefficient_list[::g]
+            self.offset //= g
+            self.denominator //= g
+
+    def from_dict(coefficients: dict[int, int]) -> LaurentPolynomial:
+        """Build a Laurent polynomial from a dictionary mapping integer powers to coefficients."""
+        if len(coefficients) == 0: return LaurentPolynomial.zero()
+        low, high = min(coefficients), max(coefficients)
+        coefficient_list = [0] * (high - low + 1)
+        for power, coefficient in coefficients.items():
+            coefficient_list[power - low] += coefficient
+        return LaurentPolynomial(coefficient_list, low)
+
+    def monomial(power: int, coefficient: int = 1) -> LaurentPolynomial:
+        return LaurentPolynomial([coefficient], power)
+
+    def zero() -> LaurentPolynomial:
+        return LaurentPolynomial([])
+
+    def one() -> LaurentPolynomial:
+        return LaurentPolynomial([1])
+
+    def is_zero(self) -> bool:
+        return len(self.coefficient_list) == 0
+
+    def terms(self):
+        """Yield each nonzero term as a pair of its exponent and coefficient."""
+        for i, coefficient in enumerate(self.coefficient_list):
+            if coefficient != 0:
+                exponent = Fraction(self.offset + i, self.denominator)
+                yield (int(exponent) if exponent.denominator == 1 else exponent), coefficient
+
+    @property
+    def coefficients(self) -> dict[tuple[int | Fraction], int]:
+        """The terms of the polynomial in the same form as `Polynomial.coefficients`."""
+        return {(exponent,): coefficient for exponent, coefficient in self.terms()}
+
+    def to_polynomial(self) -> Polynomial:
+        return Polynomial(self.coefficients, 1)
+
+    def _with_denominator(self, denominator: int) -> LaurentPolynomial:
+        """Return an unnormalized copy whose exponents are expressed over `denominator`."""
+        stride = denominator // self.denominator
+        result = LaurentPolynomial.__new__(LaurentPolynomial)
+        result.offset = self.offset * stride
+        result.denominator = denominator
+        if stride == 1:
+            result.coefficient_list = list(self.coefficient_list)
+        else:
+            result.coefficient_list = [0] * (stride * (len(self.coefficient_list) - 1) + 1) if self.coefficient_list else []
+            result.coefficient_list[::stride] = self.coefficient_list
+        return result
+
+    def _aligned(self, other: LaurentPolynomial) -> tuple[LaurentPolynomial, LaurentPolynomial]:
+        if self.denominator == other.denominator: return self, other
+        denominator = lcm(self.denominator, other.denominator)
+        return self._with_denominator(denominator), other._with_denominator(denominator)
+
+    def shifted(self, power: int) -> LaurentPolynomial:
+        """Return the product of the polynomial with the monomial of the given integer power."""
+        result = LaurentPolynomial.__new__(LaurentPolynomial)
+        result.coefficient_list = list(self.coefficient_list)
+        result.offset = self.offset + power * self.denominator if self.coefficient_list else 0
+        result.denominator = self.denominator
+        return result
+
+    def inverted(self) -> LaurentPolynomial:
+        """Return the polynomial with every exponent negated (substitutes x -> x^-1)."""
+        if self.is_zero(): return LaurentPolynomial.zero()
+        return LaurentPolynomial(self.coefficient_list[::-1], -(self.offset + len(self.coefficient_list) - 1), self.denominator)
+
+    def divide_exponents(self, k: int) -> LaurentPolynomial:
+        """Return the polynomial with every exponent divided by `k` (substitutes x -> x^(1/k))."""
+        return LaurentPolynomial(self.coefficient_list, self.offset, self.denominator * k)
+
+    def __call__(self, *values: float) -> float:
+        """Evaluate the polynomial at a number, or elementwise at a NumPy array of numbers.
+
+        Rational exponents take principal roots, so evaluate them at negative
+        points of an array by giving the array a complex dtype.
+        """
+        if len(values) != 1:
+            raise ValueError("knot polynomial requires 1 input variables.")
+        value = values[0]
+        if self.denominator != 1:
+            # Evaluate in x^(1/denominator), in which the exponents are integers.
+            value = value ** (1 / self.denominator)
+        # Horner's method, then multiply by the lowest power.
+        result = value * 0
+        for coefficient in reversed(self.coefficient_list):
+            result = result * value + coefficient
+        if self.offset < 0:
+            return result / value ** -self.offset
+        return result * value ** self.offset
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LaurentPolynomial):
+            return (self.offset == other.offset
+                and self.denominator == other.denominator
+                and self.coefficient_list == other.coefficient_list)
+        if isinstance(other, Polynomial):
+            # Products of `Polynomial`s with no terms lose their variable count.
+            return self.coefficients == other.coefficients and (other.n_vars == 1 or self.is_zero())
+        return NotImplemented
+
+    def __neg__(self) -> LaurentPolynomial:
+        return LaurentPolynomial([-coefficient for coefficient in self.coefficient_list], self.offset, self.denominator)
+
+    def __iadd__(self, other: LaurentPolynomial) -> LaurentPolynomial:
+        if other.is_zero(): return self
+        if self.is_zero():
+            self.coefficient_list = list(other.coefficient_list)
+            self.offset, self.denominator = other.offset, other.denominator
+            return self
+        if self.denominator != other.denominator:
+            aligned, other = self._aligned(other)
+            self.coefficient_list, self.offset, self.denominator = aligned.coefficient_list, aligned.offset, aligned.denominator
+        coefficient_list = self.coefficient_list
+        # Grow the coefficient list on either side to cover the terms of `other`.
+        if other.offset < self.offset:
+            coefficient_list[:0] = [0] * (self.offset - other.offset)
+            self.offset = other.offset
+        end = other.offset - self.offset + len(other.coefficient_list)
+        if end > len(coefficient_list):
+            coefficient_list.extend([0] * (end - len(coefficient_list)))
+        start = other.offset - self.offset
+        for i, coefficient in enumerate(other.coefficient_list, start):
+            coefficient_list[i] += coefficient
+        self._normalize()
+        return self
+
+    def __add__(self, other: LaurentPolynomial) -> LaurentPolynomial:
+        result = self.shifted(0)
+        result += other
+        return result
+
+    def __sub__(self, other: LaurentPolynomial) -> LaurentPolynomial:
+        return self + -other
+
+    def __mul__(self, other: LaurentPolynomial) -> LaurentPolynomial:
+        if self.is_zero() or other.is_zero(): return LaurentPolynomial.zero()
+        left, right = self._aligned(other)
+        # Convolve the two coefficient lists.
+        product = [0] * (len(left.coefficient_list) + len(right.coefficient_list) - 1)
+        right_list = right.coefficient_list
+        for i, coefficient1 in enumerate(left.coefficient_list):
+            if coefficient1 == 0: continue
+            for j, coefficient2 in enumerate(right_list):
+                product[i + j] += coefficient1 * coefficient2
+        return LaurentPolynomial(product, left.offset + right.offset, left.denominator)
+
+    def exact_divide(self, other: LaurentPolynomial) -> LaurentPolynomial:
+        """Return the quotient of the polynomial by one that divides it exactly.
+
+        Raises `ValueError` if the quotient is not a Laurent polynomial with integer coefficients.
+        """
+        if other.is_zero():
+            raise ZeroDivisionError("cannot divide a knot polynomial by zero.")
+        if self.is_zero(): return LaurentPolynomial.zero()
+        left, right = self._aligned(other)
+        remainder = list(left.coefficient_list)
+        divisor = right.coefficient_list
+        quotient = [0] * (len(remainder) - len(divisor) + 1)
+        # Cancel the lowest remaining term at each step.
+        for i in range(len(quotient)):
+            if remainder[i] == 0: continue
+            q, r = divmod(remainder[i], divisor[0])
+            if r != 0: break
+            quotient[i] = q
+            for j, coefficient in enumerate(divisor, i):
+                remainder[j] -= q * coefficient
+        if any(remainder):
+            raise ValueError("knot polynomial does not divide exactly.")
+        return LaurentPolynomial(quotient, left.offset - right.offset, left.denominator)
+
+    def __pow__(self, power: int) -> LaurentPolynomial:
+        if power < 0:
+            raise ValueError("cannot take a knot polynomial to a negative power.")
+        result = LaurentPolynomial.one()
+        base = self
+        while power:
+            if power & 1:
+                result = result * base
+            power >>= 1
+            if power:
+                base = base * base
+        return result
+
+    def var(self, *vars: str) -> str:
+        """Display a knot polynomial using a specified representation of a variable."""
+        return self.to_polynomial().var(*vars)
+
+    def __repr__(self) -> str:
+        return self.var('_')
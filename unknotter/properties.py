@@ -1,60 +1,303 @@
-from itertools import product
+from array import array
+from collections.abc import Iterable
+import sys
 from unknotter.diagram import *
+from unknotter.instrumentation import instrumented
+
+def _gauss_code_and_signs(self: Diagram) -> tuple[list[int], list[int]]:
+    """Return the Gauss code of a diagram and the sign of each of its crossings (see `gauss_code`)."""
+    n_edges = 2 * len(self.pd_code)
+    # The crossing index entered by each edge, and whether it enters over.
+    passages: list[tuple[int, bool] | None] = [None] * (n_edges + 1)
+    over_at_d = [False] * len(self.pd_code)
+    for crossing_index, (a, b, c, d) in enumerate(self.pd_code):
+        # With one crossing both edges of the over strand follow each other,
+        # so the over strand enters on the edge the under strand does not.
+        over_at_d[crossing_index] = self._next(b) != d or b == a
+        over = d if over_at_d[crossing_index] else b
+        for edge, is_over in ((a, False), (over, True)):
+            if not 1 <= edge <= n_edges or passages[edge] is not None:
+                raise ValueError("diagram is not consistently oriented.")
+            passages[edge] = (crossing_index, is_over)
+
+    labels = [0] * len(self.pd_code)
+    code: list[int] = []
+    signs: list[int] = []
+    for crossing_index, is_over in passages[1:]:
+        if not labels[crossing_index]:
+            signs.append(1 if over_at_d[crossing_index] else -1)
+            labels[crossing_index] = len(signs)
+        code.append(labels[crossing_index] if is_over else -labels[crossing_index])
+    return code, signs
 
 def gauss_code(self: Diagram) -> list[int]:
-    """Return the Gauss code of a diagram."""
-    raise NotImplementedError
+    """Return the Gauss code of a diagram.
+
+    Following the edges from 1, crossings are numbered from 1 in the order
+    they are first passed, and each pass is written as the number of the
+    crossing, negated if the strand passes under.
+    """
+    return _gauss_code_and_signs(self)[0]
+
+def gauss_signs(self: Diagram) -> list[int]:
+    """Return the sign (1 or -1, as in `get_writhe`) of each crossing, numbered as in the Gauss code."""
+    return _gauss_code_and_signs(self)[1]
+
+def from_gauss_code(gauss_code: list[int], signs: list[int]) -> Diagram:
+    """Build the diagram with a Gauss code and crossing signs (see `gauss_code` and `gauss_signs`).
+
+    Edge `i` of the diagram is the edge entering the `i`th pass of the Gauss code.
+    """
+    n_edges = len(gauss_code)
+    under = [0] * len(signs)
+    over = [0] * len(signs)
+    for edge, label in enumerate(gauss_code, 1):
+        passes = over if label > 0 else under
+        if not 1 <= abs(label) <= len(signs) or passes[abs(label) - 1]:
+            raise ValueError("Gauss code must pass over and under each crossing once.")
+        passes[abs(label) - 1] = edge
+    if 2 * len(signs) != n_edges:
+        raise ValueError("Gauss code must pass over and under each crossing once.")
+
+    pd_code: PDNotation = []
+    for i, j, sign in zip(under, over, signs):
+        next_i, next_j = i % n_edges + 1, j % n_edges + 1
+        pd_code.append((i, next_j, next_i, j) if sign > 0 else (i, j, next_i, next_j))
+    return Diagram(pd_code)
+
+def _dt_notation_and_signs(self: Diagram) -> tuple[list[int], list[int]]:
+    """Return the DT notation of a diagram and the sign of each of its crossings (see `dt_notation`)."""
+    code, signs = _gauss_code_and_signs(self)
+    # The edge of the first pass of each crossing.
+    first = [0] * len(signs)
+    dt = [0] * len(signs)
+    dt_signs = [0] * len(signs)
+    for edge, label in enumerate(code, 1):
+        crossing = abs(label) - 1
+        if not first[crossing]:
+            first[crossing] = edge
+            continue
+        if first[crossing] % 2 == edge % 2:
+            raise ValueError("diagram has a crossing passed twice on edges of the same parity.")
+        odd, even = (first[crossing], edge) if edge % 2 == 0 else (edge, first[crossing])
+        even_is_over = (label > 0) == (even == edge)
+        dt[odd // 2] = -even if even_is_over else even
+        dt_signs[odd // 2] = signs[crossing]
+    return dt, dt_signs
 
 def dt_notation(self: Diagram) -> list[int]:
-    """Return the Dowker-Thistlethwait notation of a diagram."""
-    raise NotImplementedError
-
-def kauffman_bracket(self: Diagram) -> Polynomial:
-    """Return the Kauffman bracket polynomial of a diagram."""
-    if self == Diagram([(1, 1, 2, 2)]): return Polynomial({3: -1})
-
-    factored_poly = [(((a, d), (b, c)), ((a, b), (c, d))) for a, b, c, d in self.pd_code]
-
-    distributed_poly = [(sum(1-2*i for i in ii), [factor for term in terms for factor in term]) for ii, terms in zip(product(*(range(2) for _ in factored_poly)), product(*factored_poly))]
-
-    for power, term in distributed_poly:
-        matched_at_all = True
-        while matched_at_all:
-            matched_at_all = False
-            i = 0
-            if len(term) == 1: break
-            while i < len(term):
-                j = i + 1
-                while j < len(term):
-                    x1, x2 = term[i], term[j]
-                    a1, b1 = x1
-                    a2, b2 = x2
-
-                    matched = True
-
-                    if a1 == b2 and a2 == b1 or a1 == a2 and b1 == b2:
-                        term.append((a1, a1))
-                    elif a1 == a2:
-                        term.append((b1, b2))
-                    elif a1 == b2:
-                        term.append((b1, a2))
-                    elif b1 == a2:
-                        term.append((a1, b2))
-                    elif b1 == b2:
-                        term.append((a1, a2))
-                    else:
-                        matched = False
-
-                    if matched: del term[j], term[i]
-                    if matched: matched_at_all = True
-                    j += 1
-                i += 1
-
-    newlist = [(power, len(term)-1) for power, term in distributed_poly]
-
-    disjoint_unknot_poly = Polynomial({2: -1, -2: -1})
-
-    return sum((Polynomial({power1: 1}) * disjoint_unknot_poly**power2 for power1, power2 in newlist), Polynomial.zero())
+    """Return the Dowker-Thistlethwaite notation of a diagram.
+
+    Every crossing of a knot is passed once on an odd edge and once on an even
+    edge. For the crossings passed on edges 1, 3, 5 and so on, the notation
+    lists the even edge, negated if the even edge passes over.
+    """
+    return _dt_notation_and_signs(self)[0]
+
+def dt_signs(self: Diagram) -> list[int]:
+    """Return the sign (1 or -1, as in `get_writhe`) of each crossing, in the order of `dt_notation`."""
+    return _dt_notation_and_signs(self)[1]
+
+def from_dt_notation(dt_notation: list[int], signs: list[int]) -> Diagram:
+    """Build the diagram with a Dowker-Thistlethwaite notation and crossing signs (see `dt_notation` and `dt_signs`)."""
+    gauss: list[int] = [0] * (2 * len(dt_notation))
+    for crossing, even in enumerate(dt_notation, 1):
+        odd = 2 * crossing - 1
+        if even == 0 or abs(even) % 2 or abs(even) > len(gauss) or gauss[abs(even) - 1]:
+            raise ValueError("DT notation must list each even edge once.")
+        gauss[odd - 1] = crossing if even > 0 else -crossing
+        gauss[abs(even) - 1] = -crossing if even > 0 else crossing
+    return from_gauss_code(gauss, signs)
+
+def pack_gauss_code(self: Diagram) -> bytes:
+    """Encode a diagram as bytes through its Gauss code and crossing signs.
+
+    The bytes are the number of crossings n as a base-128 varint, then each pass
+    of the Gauss code as 2*(crossing - 1) + (1 if over), in 1 byte if n < 128, in
+    2 if n < 32768 and in 4 otherwise, and then the signs as n bits, set for
+    positive crossings. Diagrams with the same crossings (see `Diagram.identical`)
+    pack to the same bytes, so the bytes also serve as a compact key.
+    """
+    code, signs = _gauss_code_and_signs(self)
+    n = len(signs)
+    header = bytearray()
+    while True:
+        header.append((n & 0x7f) | (0x80 if n >= 0x80 else 0))
+        n >>= 7
+        if not n: break
+    passes = array(_pack_typecode(len(signs)), (2*abs(label) - 2 + (label > 0) for label in code))
+    if sys.byteorder == 'big': passes.byteswap()
+    sign_bits = sum(1 << i for i, sign in enumerate(signs) if sign > 0)
+    return bytes(header) + passes.tobytes() + sign_bits.to_bytes((len(signs) + 7) // 8, 'little')
+
+def unpack_gauss_code(data: bytes) -> Diagram:
+    """Decode a diagram from the bytes of `pack_gauss_code`."""
+    n = 0
+    shift = 0
+    position = 0
+    while True:
+        byte = data[position]
+        n |= (byte & 0x7f) << shift
+        shift += 7
+        position += 1
+        if byte < 0x80: break
+    passes = array(_pack_typecode(n))
+    end = position + 2 * n * passes.itemsize
+    passes.frombytes(data[position:end])
+    if sys.byteorder == 'big': passes.byteswap()
+    sign_bits = int.from_bytes(data[end:end + (n + 7) // 8], 'little')
+    code = [(value >> 1) + 1 if value & 1 else -(value >> 1) - 1 for value in passes]
+    signs = [1 if sign_bits >> i & 1 else -1 for i in range(n)]
+    return from_gauss_code(code, signs)
+
+def _pack_typecode(crossing_count: int) -> str:
+    """Return the array typecode wide enough for the passes of `pack_gauss_code`."""
+    if crossing_count < 1 << 7: return 'B'
+    if crossing_count < 1 << 15: return 'H'
+    return 'I'
+
+def _crossing_order(self: Diagram) -> list[int]:
+    """Return an order in which to contract the crossings of a diagram.
+
+    Crossings are chosen greedily so that each new crossing shares as many
+    edges as possible with the crossings already contracted. This keeps the
+    boundary of the contracted region, and thus the size of the state table
+    in `kauffman_bracket`, small.
+    """
+    remaining = set(range(len(self.pd_code)))
+    boundary: set[Edge] = set()
+    order: list[int] = []
+    while remaining:
+        # Prefer the crossing closing the most boundary edges, then the one
+        # opening the fewest new ones, then the lowest index.
+        best = min(remaining, key=lambda i: (
+            -sum(edge in boundary for edge in self.pd_code[i]),
+            len(set(self.pd_code[i]) - boundary),
+            i))
+        remaining.remove(best)
+        order.append(best)
+        boundary ^= {edge for edge in self.pd_code[best] if self.pd_code[best].count(edge) == 1}
+    return order
+
+def _join_arc(matching: dict[Edge, Edge], x: Edge, y: Edge) -> int:
+    """Join the arc `x`-`y` onto the open strands of `matching` in place.
+
+    `matching` maps each open end of the contracted region to the other end
+    of its strand. Returns the number of loops closed by the new arc.
+    """
+    if x == y: return 1
+    if x in matching:
+        end = matching.pop(x)
+        del matching[end]
+        if end == y: return 1
+        x = end
+    if y in matching:
+        end = matching.pop(y)
+        del matching[end]
+        if end == x: return 1
+        y = end
+    matching[x] = y
+    matching[y] = x
+    return 0
+
+def _contract(self: Diagram, one, zero, factor, modulus: int | None = None):
+    """Sum the states of a diagram for `kauffman_bracket` in any ring of values.
+
+    `factor(power, loops)` is the value of A^power * (-A^2 - A^-2)^loops,
+    which multiplies a partial state as it is extended by one crossing. If
+    `modulus` is given, the values are integers reduced modulo it.
+    """
+    order = _crossing_order(self)
+    # Multipliers indexed by (power, loops).
+    factors: dict[tuple[int, int], object] = {}
+
+    table: dict[tuple[tuple[Edge, Edge], ...], object] = {(): one}
+    for step, crossing_index in enumerate(order):
+        a, b, c, d = self.pd_code[crossing_index]
+        is_last = step == len(order) - 1
+        new_table: dict[tuple[tuple[Edge, Edge], ...], object] = {}
+        for key, value in table.items():
+            for power, arcs in ((1, ((a, d), (b, c))), (-1, ((a, b), (c, d)))):
+                matching = {}
+                for x, y in key:
+                    matching[x] = y
+                    matching[y] = x
+                loops = sum(_join_arc(matching, x, y) for x, y in arcs)
+                # The bracket counts one less than the number of loops in
+                # each state, and every state closes its final loop here.
+                if is_last: loops -= 1
+                if (power, loops) not in factors:
+                    factors[power, loops] = factor(power, loops)
+                term = value * factors[power, loops]
+                new_key = tuple(sorted((x, y) for x, y in matching.items() if x < y))
+                if new_key in new_table:
+                    new_table[new_key] += term
+                else:
+                    new_table[new_key] = term
+        if modulus is not None:
+            new_table = {key: value % modulus for key, value in new_table.items()}
+        table = new_table
+
+    return table.get((), zero)
+
+@instrumented('invariant')
+def kauffman_bracket(self: Diagram) -> LaurentPolynomial:
+    """Return the Kauffman bracket polynomial of a diagram.
+
+    Rather than expanding all 2^n states at once, crossings are contracted one
+    at a time (see `_crossing_order`) into a table keyed by how the open edges
+    of the contracted region are connected. Each entry holds the polynomial
+    summed over all partial states with that connectivity, so memory is bounded
+    by the number of connectivities of the boundary rather than by the number
+    of states.
+    """
+    if self == Diagram([(1, 1, 2, 2)]): return LaurentPolynomial.monomial(3, -1)
+    disjoint_unknot_poly = LaurentPolynomial.from_dict({2: -1, -2: -1})
+    return _contract(self, LaurentPolynomial.one(), LaurentPolynomial.zero(),
+        lambda power, loops: (disjoint_unknot_poly**loops).shifted(power))
+
+@instrumented('invariant')
+def bracket_at(self: Diagram, a: complex | int, modulus: int | None = None) -> complex | int:
+    """Return the Kauffman bracket of a diagram evaluated at A = `a`.
+
+    The bracket is summed as in `kauffman_bracket`, but with numbers in place
+    of polynomials. `a` may be a NumPy array of complex numbers, to evaluate at
+    many points in one pass. If `modulus` is given, `a` is an integer and the
+    result is computed modulo `modulus`, which should be a prime not dividing `a`.
+    """
+    if modulus is None:
+        loop = -a**2 - a**-2
+        if self == Diagram([(1, 1, 2, 2)]): return -a**3
+        return _contract(self, 1, 0, lambda power, loops: a**power * loop**loops)
+    inverse = pow(a, -1, modulus)
+    loop = (-a*a - inverse*inverse) % modulus
+    if self == Diagram([(1, 1, 2, 2)]): return -pow(a, 3, modulus) % modulus
+    return _contract(self, 1, 0, lambda power, loops: pow(a, power, modulus) * pow(loop, loops, modulus) % modulus, modulus)
+
+def jones_at(self: Diagram, a: complex | int, modulus: int | None = None) -> complex | int:
+    """Return the Jones polynomial of a diagram evaluated at t = `a`^4 (see `bracket_at`).
+
+    This is the value of `jones(self)` at t = `a`^4, found without building any polynomial.
+    """
+    writhe = get_writhe(self)
+    bracket = bracket_at(self, a, modulus)
+    if modulus is None:
+        return (-a**3)**writhe * bracket
+    return pow(-a**3, writhe, modulus) * bracket % modulus
+
+# The point and prime 2^61 - 1 at which `jones_fingerprint` evaluates the Jones polynomial.
+FINGERPRINT_POINT = 0x2545f4914f6cdd1d
+FINGERPRINT_MODULUS = 2**61 - 1
+
+def jones_fingerprint(self: Diagram, point: int = FINGERPRINT_POINT, modulus: int = FINGERPRINT_MODULUS) -> int:
+    """Return the Jones polynomial of a diagram evaluated at a point modulo a large prime.
+
+    Diagrams with the same Jones polynomial have the same fingerprint. Two
+    different polynomials of degree span d have the same fingerprint at a
+    random point with probability at most 4d / `modulus`, so fingerprints can
+    stand in for the polynomials when comparing large datasets.
+    """
+    return jones_at(self, point % modulus, modulus)
 
 def get_writhe(self: Diagram) -> int:
     """Return the writhe of a diagram."""
@@ -66,13 +309,192 @@ def get_writhe(self: Diagram) -> int:
             writhe += 1
     return writhe
 
-def jones(self: Diagram) -> Polynomial:
+@instrumented('invariant')
+def jones(self: Diagram) -> LaurentPolynomial:
     """Return the Jones polynomial of a diagram."""
     writhe = get_writhe(self)
     bracket = kauffman_bracket(self)
-    raw_jones_polynomial = bracket * Polynomial({3*writhe: 1 if writhe % 2 == 0 else -1})
-    coefficients = {powers[0]/4: coefficients for powers, coefficients in raw_jones_polynomial.coefficients.items()}
-    return Polynomial(coefficients)
+    raw_jones_polynomial = bracket * LaurentPolynomial.monomial(3*writhe, 1 if writhe % 2 == 0 else -1)
+    return raw_jones_polynomial.divide_exponents(4)
+
+def _arcs(self: Diagram) -> list[int]:
+    """Number the arcs of a diagram, the strands running from one undercrossing to the next.
+
+    Returns the arc of each edge, indexed by edge (index 0 is unused).
+    """
+    n_edges = 2 * len(self.pd_code)
+    starts = [False] * (n_edges + 1)
+    for _, _, c, _ in self.pd_code:
+        starts[c] = True
+    arcs = [0] * (n_edges + 1)
+    first = self.pd_code[0][2]
+    arc = -1
+    edge = first
+    for _ in range(n_edges):
+        if starts[edge]:
+            arc += 1
+        arcs[edge] = arc
+        edge = self._next(edge)
+    return arcs
+
+def _bareiss_determinant(matrix: list[list[LaurentPolynomial]]) -> LaurentPolynomial:
+    """Return the determinant of a square matrix of Laurent polynomials by fraction-free elimination.
+
+    Each step of Bareiss' algorithm divides exactly by the previous pivot, which
+    keeps the entries polynomials of bounded degree. `matrix` is overwritten.
+    """
+    size = len(matrix)
+    sign = 1
+    previous = LaurentPolynomial.one()
+    for k in range(size - 1):
+        if matrix[k][k].is_zero():
+            pivot = next((i for i in range(k + 1, size) if not matrix[i][k].is_zero()), None)
+            if pivot is None: return LaurentPolynomial.zero()
+            matrix[k], matrix[pivot] = matrix[pivot], matrix[k]
+            sign = -sign
+        pivot_row = matrix[k]
+        for i in range(k + 1, size):
+            row = matrix[i]
+            factor = row[k]
+            for j in range(k + 1, size):
+                entry = pivot_row[k] * row[j]
+                if not factor.is_zero() and not pivot_row[j].is_zero():
+                    entry -= factor * pivot_row[j]
+                row[j] = entry.exact_divide(previous)
+        previous = pivot_row[k]
+    if size == 0: return LaurentPolynomial.one()
+    return matrix[-1][-1] if sign > 0 else -matrix[-1][-1]
+
+@instrumented('invariant')
+def alexander(self: Diagram) -> LaurentPolynomial:
+    """Return the Alexander polynomial of a diagram.
+
+    Each crossing gives a row of the Alexander matrix over the arcs (see
+    `_arcs`): 1 - t for the over arc, and t and -1 for the incoming and outgoing
+    under arcs if the crossing is positive, or -1 and t if it is negative. Any
+    minor with one row and one column removed is the polynomial, computed in
+    time cubic in the number of crossings by `_bareiss_determinant`. The result
+    is normalized so that it is symmetric in t and t^-1 and is 1 at t = 1.
+    """
+    if len(self.pd_code) == 0: return LaurentPolynomial.one()
+    arcs = _arcs(self)
+    one_minus_t = LaurentPolynomial([1, -1])
+    t, minus_one = LaurentPolynomial.monomial(1), LaurentPolynomial.monomial(0, -1)
+    matrix = [[LaurentPolynomial.zero() for _ in self.pd_code] for _ in self.pd_code]
+    for row, (a, b, c, d) in zip(matrix, self.pd_code):
+        incoming, outgoing = (t, minus_one) if self._next(b) != d else (minus_one, t)
+        row[arcs[b]] += one_minus_t
+        row[arcs[a]] += incoming
+        row[arcs[c]] += outgoing
+
+    polynomial = _bareiss_determinant([row[1:] for row in matrix[1:]])
+    if polynomial.is_zero(): return polynomial
+    # The span of a knot's Alexander polynomial is even, so it can be centered.
+    polynomial = polynomial.shifted(-polynomial.offset - (len(polynomial.coefficient_list) - 1) // 2)
+    return polynomial if sum(polynomial.coefficient_list) > 0 else -polynomial
+
+def determinant(self: Diagram) -> int:
+    """Return the determinant of a knot, |alexander(-1)|."""
+    polynomial = alexander(self)
+    return abs(sum(coefficient if (polynomial.offset + i) % 2 == 0 else -coefficient
+        for i, coefficient in enumerate(polynomial.coefficient_list)))
+
+# The primes `is_colorable` tries when none are given.
+COLORING_PRIMES = (3, 5, 7)
+
+def _coloring_relations(self: Diagram) -> list[tuple[int, int, int]]:
+    """Return the arcs (over, incoming under, outgoing under) at each crossing of a diagram (see `_arcs`)."""
+    arcs = _arcs(self)
+    return [(arcs[b], arcs[a], arcs[c]) for a, b, c, _ in self.pd_code]
+
+def _rank_mod(matrix: list[list[int]], p: int) -> int:
+    """Return the rank of a matrix over the integers mod a prime `p`. `matrix` is overwritten."""
+    rank = 0
+    columns = len(matrix[0]) if matrix else 0
+    for k in range(columns):
+        pivot = next((i for i in range(rank, len(matrix)) if matrix[i][k] % p), None)
+        if pivot is None: continue
+        matrix[rank], matrix[pivot] = matrix[pivot], matrix[rank]
+        pivot_row = matrix[rank]
+        inverse = pow(pivot_row[k], -1, p)
+        for j in range(k, columns):
+            pivot_row[j] = pivot_row[j] * inverse % p
+        for i in range(rank + 1, len(matrix)):
+            row = matrix[i]
+            factor = row[k] % p
+            if factor:
+                for j in range(k, columns):
+                    row[j] = (row[j] - factor * pivot_row[j]) % p
+        rank += 1
+    return rank
+
+def fox_colorings(self: Diagram, p: int) -> int:
+    """Return the number of Fox p-colorings of a diagram, for a prime `p`.
+
+    A p-coloring assigns each arc a value mod p such that twice the over arc
+    equals the sum of the two under arcs at every crossing. The colorings are
+    the null space of these relations, so there are p^(arcs - rank) of them.
+    The unknot has only the p constant colorings.
+    """
+    if len(self.pd_code) == 0: return p
+    matrix = [[0] * len(self.pd_code) for _ in self.pd_code]
+    for row, (over, incoming, outgoing) in zip(matrix, _coloring_relations(self)):
+        row[over] += 2
+        row[incoming] -= 1
+        row[outgoing] -= 1
+    return p ** (len(self.pd_code) - _rank_mod(matrix, p))
+
+def is_colorable(self: Diagram, primes: Iterable[int] = COLORING_PRIMES) -> bool:
+    """Check if a diagram has a non-constant Fox p-coloring for any of `primes`, which proves it is knotted."""
+    return any(fox_colorings(self, p) > p for p in primes)
+
+def fox_colorings_batch(diagrams: Iterable[Diagram], primes: Iterable[int] = COLORING_PRIMES):
+    """Count the Fox p-colorings (see `fox_colorings`) of many diagrams at once with numpy.
+
+    The relation matrices of all diagrams are padded to the same size and
+    reduced together. Returns an integer array with a row for each diagram and a
+    column for each prime.
+    """
+    # Imported here so that the rest of the module does not need numpy.
+    import numpy as np
+    diagrams = list(diagrams)
+    primes = list(primes)
+    size = max((len(diagram.pd_code) for diagram in diagrams), default=0)
+    # The (diagram, crossing, over arc, incoming arc, outgoing arc) of every crossing.
+    entries = np.array([
+        (i, row, *arcs)
+        for i, diagram in enumerate(diagrams) if diagram.pd_code
+        for row, arcs in enumerate(_coloring_relations(diagram))], dtype=np.int64).reshape(-1, 5)
+    relations = np.zeros((len(diagrams), size, size), dtype=np.int64)
+    np.add.at(relations, (entries[:, 0], entries[:, 1], entries[:, 2]), 2)
+    np.add.at(relations, (entries[:, 0], entries[:, 1], entries[:, 3]), -1)
+    np.add.at(relations, (entries[:, 0], entries[:, 1], entries[:, 4]), -1)
+    arc_counts = np.array([max(len(diagram.pd_code), 1) for diagram in diagrams], dtype=np.int64)
+
+    counts = np.zeros((len(diagrams), len(primes)), dtype=np.int64)
+    batch = np.arange(len(diagrams))
+    rows = np.arange(size)
+    for column, p in enumerate(primes):
+        matrix = (relations % p).astype(np.int32)
+        inverses = np.array([0] + [pow(x, -1, p) for x in range(1, p)], dtype=np.int32)
+        rank = np.zeros(len(diagrams), dtype=np.int64)
+        for k in range(size):
+            # Move the first row at or below each matrix's rank with a nonzero
+            # entry in column k up to the rank, and scale it to a pivot of 1.
+            candidates = (matrix[:, :, k] != 0) & (rows >= rank[:, None])
+            found = candidates.any(axis=1)
+            target = np.minimum(rank, size - 1)
+            pivot = np.where(found, candidates.argmax(axis=1), target)
+            pivot_rows = matrix[batch, pivot]
+            matrix[batch, pivot] = matrix[batch, target]
+            pivot_rows = np.where(found[:, None], pivot_rows * inverses[pivot_rows[:, k]][:, None] % p, pivot_rows)
+            matrix[batch, target] = pivot_rows
+            # Clear column k below the pivot.
+            factors = np.where((rows > target[:, None]) & found[:, None], matrix[:, :, k], 0)
+            matrix[:, :, k:] = (matrix[:, :, k:] - factors[:, :, None] * pivot_rows[:, None, k:]) % p
+            rank += found
+        counts[:, column] = p ** (arc_counts - rank)
+    return counts
 
 def get_edges(self: Diagram) -> list[Edge]:
     """Return a list of all edges in a diagram with their integer values."""
@@ -82,18 +504,70 @@ def is_infinity_unknot(self: Diagram) -> bool:
     return self == Diagram([(1, 2, 2, 1)]) or self == Diagram([(2, 2, 1, 1)])
 
 def _is_valid(self: Diagram) -> bool:
-    edges = get_edges(self)
+    """Check that every edge from 1 to 2n appears exactly twice in the crossings of the diagram."""
+    n_edges = 2 * len(self.pd_code)
+    counts = [0] * (n_edges + 1)
     for crossing in self.pd_code:
         for edge in crossing:
-            if edge not in edges:
+            if not 1 <= edge <= n_edges:
                 return False
-    for edge in edges:
-        edge_count = 0
-        for crossing in self.pd_code:
-            edge_count += crossing.count(edge)
-        if edge_count != 2:
+            counts[edge] += 1
+    return all(count == 2 for count in counts[1:])
+
+def _is_oriented(self: Diagram) -> bool:
+    """Check that the edges of every crossing follow one orientation of a single strand.
+
+    The under strand must go from the first edge to the third, and the over strand
+    from the second edge to the fourth or the other way around. Following the
+    strand, each edge must then enter exactly one crossing and leave exactly one.
+    """
+    n_edges = 2 * len(self.pd_code)
+    entering = [0] * (n_edges + 1)
+    for a, b, c, d in self.pd_code:
+        if c != self._next(a):
             return False
-    return True
+        # With one crossing, both edges of the over strand follow each other,
+        # so it enters on the edge the under strand does not.
+        if d == self._next(b) and not (b == a and b == self._next(d)):
+            entering[b] += 1
+        elif b == self._next(d):
+            entering[d] += 1
+        else:
+            return False
+        entering[a] += 1
+    return all(count == 1 for count in entering[1:])
+
+def _is_planar(self: Diagram) -> bool:
+    """Check that the faces of the diagram satisfy Euler's formula, V - E + F = 2 with n crossings and 2n edges."""
+    if len(self.pd_code) == 0: return True
+    return len(self.faces().faces) == len(self.pd_code) + 2
+
+VALIDATION_LEVELS = ('off', 'cheap', 'full')
+_validation_level = 'cheap'
+
+def set_validation_level(level: str):
+    """Set the level `validate` uses when none is given: 'off', 'cheap' or 'full'."""
+    global _validation_level
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"validation level must be one of {VALIDATION_LEVELS}.")
+    _validation_level = level
+
+def validate(self: Diagram, level: str | None = None) -> bool:
+    """Check that a diagram is well-formed, in time linear in its number of crossings.
+
+    With level 'off' nothing is checked. With 'cheap', every edge from 1 to 2n
+    must appear exactly twice. With 'full', the crossings must also be
+    consistently oriented (see `_is_oriented`) and the diagram must be planar
+    (see `_is_planar`). If no level is given, the level from
+    `set_validation_level` is used ('cheap' by default).
+    """
+    level = _validation_level if level is None else level
+    if level == 'off': return True
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"validation level must be one of {VALIDATION_LEVELS}.")
+    if not _is_valid(self): return False
+    if level == 'cheap': return True
+    return _is_oriented(self) and _is_planar(self)
 
 def get_plaintext_code(self: Diagram) -> str:
     output = '['
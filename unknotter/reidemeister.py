@@ -1,8 +1,12 @@
 import math
 import random
 import time
+from array import array
+from collections.abc import Iterator
 from unknotter.diagram import *
-from unknotter.properties import get_edges, is_infinity_unknot, _is_valid
+from unknotter.instrumentation import instrumented
+from unknotter.packed import PackedDiagram, _prepare_twist_buffer, _prepare_poke_buffer, _untwist_buffer, _unpoke_buffer
+from unknotter.properties import get_edges, is_colorable, is_infinity_unknot, validate
 
 def _is_unpokable(self: Diagram, edge1: Edge, edge2: Edge) -> bool:
     return any((
@@ -20,10 +24,12 @@ def _is_slidable(self: Diagram, edge1: Edge, edge2: Edge, edge3: Edge) -> bool:
         self._is_open(edge3) and self._is_closed(edge2) and self._is_half_open(edge1),
     ))
 
+@instrumented('enumerate')
 def get_twistables(self: Diagram) -> list[Edge]:
     """Return the list of edges that can be twisted (which is all of them)."""
     return get_edges(self)
 
+@instrumented('enumerate')
 def get_untwistables(self: Diagram) -> list[Edge]:
     """Return the list of edges that can be untwisted."""
     untwistables = []
@@ -32,12 +38,14 @@ def get_untwistables(self: Diagram) -> list[Edge]:
             untwistables.append(max(set(crossing), key=crossing.count))
     return untwistables
 
+@instrumented('enumerate')
 def get_pokables(self: Diagram) -> list[tuple[Edge, Edge]]:
     """Return the list of ordered pairs of edges that can be poked."""
     pokables = []
+    faces = self.faces()
     for edge in get_edges(self):
         pokable_with = []
-        face_ccw, face_cw = self._get_adjacent_faces(edge)
+        face_ccw, face_cw = faces.adjacent(edge)
         for signed_edge in face_ccw + face_cw:
             adj_edge = abs(signed_edge)
             if adj_edge != edge and adj_edge not in pokable_with:
@@ -45,6 +53,7 @@ def get_pokables(self: Diagram) -> list[tuple[Edge, Edge]]:
         pokables += ((edge, e) for e in pokable_with)
     return pokables
 
+@instrumented('enumerate')
 def get_unpokables(self: Diagram) -> list[tuple[Edge, Edge]]:
     """Return the list of ordered pairs of edges that can be unpoked."""
     if len(self.pd_code) <= 2:
@@ -52,23 +61,30 @@ def get_unpokables(self: Diagram) -> list[tuple[Edge, Edge]]:
         # We want to avoid diagrams with zero crossings.
         return []
     unpokables = []
+    faces = self.faces()
+    if 2 not in faces.histogram:
+        return []
     for edge in get_edges(self):
         if any(edge in pair for pair in unpokables):
             continue
-        face_ccw, face_cw = self._get_adjacent_faces(edge)
+        face_ccw, face_cw = faces.adjacent(edge)
         if len(face_ccw) == 2 and _is_unpokable(self, *[abs(n) for n in face_ccw]):
                 unpokables.append(tuple(sorted(abs(n) for n in face_ccw)))
         if len(face_cw) == 2 and _is_unpokable(self, *[abs(n) for n in face_cw]):
                 unpokables.append(tuple(sorted(abs(n) for n in face_cw)))
     return unpokables
 
+@instrumented('enumerate')
 def get_slidables(self: Diagram) -> list[tuple[Edge, Edge, Edge]]:
     """Return the list of ordered triplets of edges that can be slid."""
     slidables = []
+    faces = self.faces()
+    if 3 not in faces.histogram:
+        return []
     for edge in get_edges(self):
         if any(edge in triplet for triplet in slidables):
             continue
-        face_ccw, face_cw = self._get_adjacent_faces(edge)
+        face_ccw, face_cw = faces.adjacent(edge)
         if len(face_ccw) == 3 and _is_slidable(self, *[abs(n) for n in face_ccw]):
                 slidables.append(tuple(sorted(abs(n) for n in face_ccw)))
         if len(face_cw) == 3 and _is_slidable(self, *[abs(n) for n in face_cw]):
@@ -77,6 +93,8 @@ def get_slidables(self: Diagram) -> list[tuple[Edge, Edge, Edge]]:
 
 def _prepare_twist(self: Diagram, target_edge: Edge) -> PDNotation:
     """Readjust the edge values of `diagram` with the expectation of a twist at `target_edge`."""
+    if isinstance(self, PackedDiagram):
+        return _prepare_twist_buffer(self, target_edge)
     pd_code: PDNotation = []
 
     # Map over each edge in each crossing of `diagram`.
@@ -109,62 +127,74 @@ def _prepare_twist(self: Diagram, target_edge: Edge) -> PDNotation:
     
     return pd_code
 
+def _add_crossings(self: Diagram, pd_code: PDNotation | array, *crossings: Crossing) -> Diagram:
+    """Return a diagram of the same type as `self` from relabeled PD notation and new crossings."""
+    if isinstance(pd_code, array):
+        for crossing in crossings:
+            pd_code.extend(crossing)
+    else:
+        pd_code.extend(crossings)
+    return type(self)(pd_code)
+
+@instrumented('move')
 def left_positive_twist(self: Diagram, edge: Edge) -> Diagram:
     """Apply a left-positive twist on `edge`."""
     if is_infinity_unknot(self):
         if edge == 1:
-            return Diagram([(1, 2, 2, 3), (3, 1, 4, 4)])
+            return type(self)([(1, 2, 2, 3), (3, 1, 4, 4)])
         if edge == 2:
-            return Diagram([(1, 4, 2, 1), (3, 2, 4, 3)])
+            return type(self)([(1, 4, 2, 1), (3, 2, 4, 3)])
     if edge == 1 or edge == 2*len(self.pd_code):
         return left_positive_twist(self.shift(1), self._next(edge))
     pd_code = _prepare_twist(self, edge)
-    pd_code.append((edge, edge + 2, edge + 1, edge + 1))
-    return Diagram(pd_code)
+    return _add_crossings(self, pd_code, (edge, edge + 2, edge + 1, edge + 1))
 
+@instrumented('move')
 def left_negative_twist(self: Diagram, edge: Edge) -> Diagram:
     """Apply a left-negative twist on `edge`."""
     if is_infinity_unknot(self):
         if edge == 1:
-            return Diagram([(1, 2, 2, 3), (4, 3, 1, 4)])
+            return type(self)([(1, 2, 2, 3), (4, 3, 1, 4)])
         if edge == 2:
-            return Diagram([(1, 4, 2, 1), (2, 4, 3, 3)])
+            return type(self)([(1, 4, 2, 1), (2, 4, 3, 3)])
     if edge == 1 or edge == 2*len(self.pd_code):
         return left_negative_twist(self.shift(1), self._next(edge))
     pd_code = _prepare_twist(self, edge)
-    pd_code.append((edge + 1, edge, edge + 2, edge + 1))
-    return Diagram(pd_code)
+    return _add_crossings(self, pd_code, (edge + 1, edge, edge + 2, edge + 1))
 
+@instrumented('move')
 def right_positive_twist(self: Diagram, edge: Edge) -> Diagram:
     """Apply a right-positive twist on `edge`."""
     if is_infinity_unknot(self):
         if edge == 1:
-            return Diagram([(1, 2, 2, 3), (3, 4, 4, 1)])
+            return type(self)([(1, 2, 2, 3), (3, 4, 4, 1)])
         if edge == 2:
-            return Diagram([(1, 4, 2, 1), (3, 3, 4, 2)])
+            return type(self)([(1, 4, 2, 1), (3, 3, 4, 2)])
     if edge == 1 or edge == 2*len(self.pd_code):
         return right_positive_twist(self.shift(1), self._next(edge))
     pd_code = _prepare_twist(self, edge)
-    pd_code.append((edge + 1, edge + 1, edge + 2, edge))
-    return Diagram(pd_code)
+    return _add_crossings(self, pd_code, (edge + 1, edge + 1, edge + 2, edge))
 
+@instrumented('move')
 def right_negative_twist(self: Diagram, edge: Edge) -> Diagram:
     """Apply a right-negative twist on `edge`."""
     if is_infinity_unknot(self):
         if edge == 1:
-            return Diagram([(1, 2, 2, 3), (4, 4, 1, 3)])
+            return type(self)([(1, 2, 2, 3), (4, 4, 1, 3)])
         if edge == 2:
-            return Diagram([(1, 4, 2, 1), (2, 3, 3, 4)])
+            return type(self)([(1, 4, 2, 1), (2, 3, 3, 4)])
     if edge == 1 or edge == 2*len(self.pd_code):
         return right_negative_twist(self.shift(1), self._next(edge))
     pd_code = _prepare_twist(self, edge)
-    pd_code.append((edge, edge + 1, edge + 1, edge + 2))
-    return Diagram(pd_code)
+    return _add_crossings(self, pd_code, (edge, edge + 1, edge + 1, edge + 2))
 
+@instrumented('move')
 def untwist(self: Diagram, edge: Edge) -> Diagram:
     """Remove the twist adjacent to the given edge."""
     if edge == 1 or edge == 2*len(self.pd_code):
         return untwist(self.shift(1), self._next(edge))
+    if isinstance(self, PackedDiagram):
+        return _untwist_buffer(self, edge)
     pd_code: PDNotation = self.pd_code.copy()
     for i, crossing in enumerate(pd_code):
         if crossing.count(edge) == 2:
@@ -173,10 +203,12 @@ def untwist(self: Diagram, edge: Edge) -> Diagram:
     else:
         raise ReidemeisterError("given edge is not on a twist, so it cannot be untwisted.")
     pd_code = [tuple(e - 2 if e > edge else e for e in crossing) for crossing in pd_code]
-    return Diagram(pd_code)
+    return type(self)(pd_code)
 
 def _prepare_poke(self: Diagram, lower_edge: Edge, higher_edge: Edge) -> PDNotation:
     """Readjust the edge values of `diagram` with the expectation of a poke between the two edges."""
+    if isinstance(self, PackedDiagram):
+        return _prepare_poke_buffer(self, lower_edge, higher_edge)
     pd_code: PDNotation = []
 
     # Map over each edge in each crossing of `diagram`.
@@ -211,6 +243,7 @@ def _prepare_poke(self: Diagram, lower_edge: Edge, higher_edge: Edge) -> PDNotat
 
     return pd_code
 
+@instrumented('move')
 def poke(self: Diagram, under_edge: Edge, over_edge: Edge) -> Diagram:
     """Poke `under_edge` underneath `over_edge`."""
     # if under_edge == 1 or over_edge == 1 or under_edge == 2*len(self.pd_code) or over_edge == 2*len(self.pd_code):
@@ -223,14 +256,14 @@ def poke(self: Diagram, under_edge: Edge, over_edge: Edge) -> Diagram:
     # Handle infinity unknots as special cases.
     if self == Diagram([(1, 2, 2, 1)]):
         if under_edge == 1 and over_edge == 2:
-            return Diagram([(1, 4, 2, 5), (2, 6, 3, 5), (3, 6, 4, 1)])
+            return type(self)([(1, 4, 2, 5), (2, 6, 3, 5), (3, 6, 4, 1)])
         else:
-            return Diagram([(4, 2, 5, 1), (5, 2, 6, 3), (3, 6, 4, 1)])
+            return type(self)([(4, 2, 5, 1), (5, 2, 6, 3), (3, 6, 4, 1)])
     elif self == Diagram([(2, 2, 1, 1)]):
         if under_edge == 1 and over_edge == 2:
-            return Diagram([(1, 4, 2, 5), (2, 6, 3, 5), (6, 4, 1, 3)])
+            return type(self)([(1, 4, 2, 5), (2, 6, 3, 5), (6, 4, 1, 3)])
         else:
-            return Diagram([(4, 2, 5, 1), (5, 2, 6, 3), (6, 4, 1, 3)])
+            return type(self)([(4, 2, 5, 1), (5, 2, 6, 3), (6, 4, 1, 3)])
     
     lower_edge = min(under_edge, over_edge)
     higher_edge = max(under_edge, over_edge)
@@ -243,41 +276,45 @@ def poke(self: Diagram, under_edge: Edge, over_edge: Edge) -> Diagram:
     pd_code = _prepare_poke(self, lower_edge, higher_edge)
     
     # Add the two new crossings.
+    new_crossings: list[Crossing] = []
     if -higher_edge in face_cw:
         if under_edge == lower_edge:
-            pd_code.append((lower_edge, higher_edge + 2, lower_edge + 1, higher_edge + 3))
-            pd_code.append((lower_edge + 1, higher_edge + 4, lower_edge + 2, higher_edge + 3))
+            new_crossings.append((lower_edge, higher_edge + 2, lower_edge + 1, higher_edge + 3))
+            new_crossings.append((lower_edge + 1, higher_edge + 4, lower_edge + 2, higher_edge + 3))
         else:
-            pd_code.append((higher_edge + 2, lower_edge + 1, higher_edge + 3, lower_edge))
-            pd_code.append((higher_edge + 3, lower_edge + 1, higher_edge + 4, lower_edge + 2))
+            new_crossings.append((higher_edge + 2, lower_edge + 1, higher_edge + 3, lower_edge))
+            new_crossings.append((higher_edge + 3, lower_edge + 1, higher_edge + 4, lower_edge + 2))
     elif -higher_edge in face_ccw:
         if under_edge == lower_edge:
-            pd_code.append((lower_edge, higher_edge + 3, lower_edge + 1, higher_edge + 2))
-            pd_code.append((lower_edge + 1, higher_edge + 3, lower_edge + 2, higher_edge + 4))
+            new_crossings.append((lower_edge, higher_edge + 3, lower_edge + 1, higher_edge + 2))
+            new_crossings.append((lower_edge + 1, higher_edge + 3, lower_edge + 2, higher_edge + 4))
         else:
-            pd_code.append((higher_edge + 2, lower_edge, higher_edge + 3, lower_edge + 1))
-            pd_code.append((higher_edge + 3, lower_edge + 2, higher_edge + 4, lower_edge + 1))
+            new_crossings.append((higher_edge + 2, lower_edge, higher_edge + 3, lower_edge + 1))
+            new_crossings.append((higher_edge + 3, lower_edge + 2, higher_edge + 4, lower_edge + 1))
     elif higher_edge in face_cw:
         if under_edge == lower_edge:
-            pd_code.append((lower_edge, higher_edge + 4, lower_edge + 1, higher_edge + 3))
-            pd_code.append((lower_edge + 1, higher_edge + 2, lower_edge + 2, higher_edge + 3))
+            new_crossings.append((lower_edge, higher_edge + 4, lower_edge + 1, higher_edge + 3))
+            new_crossings.append((lower_edge + 1, higher_edge + 2, lower_edge + 2, higher_edge + 3))
         else:
-            pd_code.append((higher_edge + 2, lower_edge + 1, higher_edge + 3, lower_edge + 2))
-            pd_code.append((higher_edge + 3, lower_edge + 1, higher_edge + 4, lower_edge))
+            new_crossings.append((higher_edge + 2, lower_edge + 2, higher_edge + 3, lower_edge + 1))
+            new_crossings.append((higher_edge + 3, lower_edge, higher_edge + 4, lower_edge + 1))
     elif higher_edge in face_ccw:
         if under_edge == lower_edge:
-            pd_code.append((lower_edge, higher_edge + 3, lower_edge + 1, higher_edge + 4))
-            pd_code.append((lower_edge + 1, higher_edge + 3, lower_edge + 2, higher_edge + 2))
+            new_crossings.append((lower_edge, higher_edge + 3, lower_edge + 1, higher_edge + 4))
+            new_crossings.append((lower_edge + 1, higher_edge + 3, lower_edge + 2, higher_edge + 2))
         else:
-            pd_code.append((higher_edge + 2, lower_edge + 2, higher_edge + 3, lower_edge + 1))
-            pd_code.append((higher_edge + 3, lower_edge, higher_edge + 4, lower_edge + 1))
+            new_crossings.append((higher_edge + 2, lower_edge + 1, higher_edge + 3, lower_edge + 2))
+            new_crossings.append((higher_edge + 3, lower_edge + 1, higher_edge + 4, lower_edge))
 
-    return Diagram(pd_code)
+    return _add_crossings(self, pd_code, *new_crossings)
 
+@instrumented('move')
 def unpoke(self: Diagram, edge1: Edge, edge2: Edge) -> Diagram:
     """Remove the poke between the two given edges."""
     if edge1 == 1 or edge2 == 1 or edge1 == 2*len(self.pd_code) or edge2 == 2*len(self.pd_code):
         return unpoke(self.shift(1), self._next(edge1), self._next(edge2))
+    if isinstance(self, PackedDiagram):
+        return _unpoke_buffer(self, edge1, edge2)
     pd_code: PDNotation = []
     deleted_crossings = 0
     for i, crossing in enumerate(self.pd_code):
@@ -290,8 +327,9 @@ def unpoke(self: Diagram, edge1: Edge, edge2: Edge) -> Diagram:
     lower_edge = min(edge1, edge2)
     higher_edge = max(edge1, edge2)
     pd_code = [tuple(e - 4 if e > higher_edge else e if e < lower_edge else e - 2 for e in crossing) for crossing in pd_code]
-    return Diagram(pd_code)
+    return type(self)(pd_code)
 
+@instrumented('move')
 def slide(self: Diagram, edge1: Edge, edge2: Edge, edge3: Edge) -> Diagram:
     """Slide an edge over the face formed by the three given edges."""
     edges = [edge1, edge2, edge3]
@@ -327,9 +365,22 @@ def slide(self: Diagram, edge1: Edge, edge2: Edge, edge3: Edge) -> Diagram:
     
     pd_code = [tuple(crossing) for crossing in pd_code]
 
-    return Diagram(pd_code)
-
-def apply_random_move(self: Diagram, beta: float) -> Diagram:
+    return type(self)(pd_code)
+
+# All moves by name, for applying moves that were chosen or recorded elsewhere.
+MOVES = {
+    'left_positive_twist': left_positive_twist,
+    'left_negative_twist': left_negative_twist,
+    'right_positive_twist': right_positive_twist,
+    'right_negative_twist': right_negative_twist,
+    'untwist': untwist,
+    'poke': poke,
+    'unpoke': unpoke,
+    'slide': slide,
+}
+
+def _random_move(self: Diagram, beta: float, rng: random.Random = random) -> tuple[Diagram, str, tuple[Edge, ...]]:
+    """Apply a random move as `apply_random_move` does, returning the new diagram with the move's name in `MOVES` and edges."""
     numerical_weights: list[float] = [
         math.e**-beta,
         math.e**beta,
@@ -348,55 +399,75 @@ def apply_random_move(self: Diagram, beta: float) -> Diagram:
 
     weights = [0 if len(l) == 0 else w for w, l in zip(numerical_weights, options)]
 
-    move_decision = random.choices([1, 2, 3, 4, 5], weights=weights)[0]
-
+    move_decision = rng.choices([1, 2, 3, 4, 5], weights=weights)[0]
+
+    match move_decision:
+        case 1:
+            edges = (rng.choices(twistables)[0],)
+            twist_decision = rng.choices([1, 2, 3, 4])[0]
+            move = ['left_positive_twist', 'left_negative_twist', 'right_positive_twist', 'right_negative_twist'][twist_decision - 1]
+        case 2:
+            edges = (rng.choices(untwistables)[0],)
+            move = 'untwist'
+        case 3:
+            edges = rng.choices(pokables)[0]
+            move = 'poke'
+        case 4:
+            edges = rng.choices(unpokables)[0]
+            move = 'unpoke'
+        case 5:
+            edges = rng.choices(slidables)[0]
+            move = 'slide'
     try:
-        match move_decision:
-            case 1:
-                edge = random.choices(twistables)[0]
-                twist_decision = random.choices([1, 2, 3, 4])[0]
-                match twist_decision:
-                    case 1:
-                        return left_positive_twist(self, edge)
-                    case 2:
-                        return left_negative_twist(self, edge)
-                    case 3:
-                        return right_positive_twist(self, edge)
-                    case 4:
-                        return right_negative_twist(self, edge)
-            case 2:
-                edge = random.choices(untwistables)[0]
-                return untwist(self, edge)
-            case 3:
-                edges = random.choices(pokables)[0]
-                return poke(self, *edges)
-            case 4:
-                edges = random.choices(unpokables)[0]
-                return unpoke(self, *edges)
-            case 5:
-                edges = random.choices(slidables)[0]
-                return slide(self, *edges)
+        return MOVES[move](self, *edges), move, tuple(edges)
     except NotImplementedError:
-        return apply_random_move(self, beta)
+        return _random_move(self, beta, rng)
 
-def randomeister(self: Diagram, moves: int, beta: float, show: bool = False) -> list[Diagram]:
-    diagrams: list[Diagram] = [self]
+def apply_random_move(self: Diagram, beta: float, rng: random.Random = random) -> Diagram:
+    return _random_move(self, beta, rng)[0]
+
+def walk(self: Diagram, moves: int | None, beta: float, rng: random.Random = random) -> Iterator[Diagram]:
+    """Lazily yield a diagram and then each diagram of a random walk of `moves` moves from it (without end if None).
+
+    The moves are those of `apply_random_move`. Only the current diagram is
+    kept, so long walks take constant memory (see also `Trajectory`).
+    """
+    yield self
     diagram = self
-    for _ in range(moves):
-        diagram = apply_random_move(diagram, beta)
+    i = 0
+    while moves is None or i < moves:
+        diagram = apply_random_move(diagram, beta, rng)
+        yield diagram
+        i += 1
+
+def randomeister(self: Diagram, moves: int, beta: float, show: bool = False) -> list[Diagram]:
+    diagrams: list[Diagram] = []
+    for diagram in walk(self, moves, beta):
         diagrams.append(diagram)
-        if show: print(len(diagram.pd_code))
+        if show and len(diagrams) > 1: print(len(diagram.pd_code))
     return diagrams
 
+# The number of random moves `unknot_solver` makes between calls to `simplify`.
+SIMPLIFY_INTERVAL = 100
+
 def unknot_solver(self: Diagram, beta: float):
-    diagram = self
+    from unknotter.search import simplify
+    from unknotter.walker import RandomWalker
+    if is_colorable(self):
+        print('Given diagram has a nontrivial Fox coloring; it is not an unknot.')
+        return
+    diagram, _ = simplify(self)
+    walker = RandomWalker(diagram, beta)
     i = 0
     t0 = time.time()
     while len(diagram.pd_code) > 2:
-        diagram = apply_random_move(diagram, beta)
+        diagram = walker.step()
         # print(len(diagram.pd_code), end=', ')
-        assert _is_valid(diagram)
+        assert validate(diagram)
         i += 1
+        if i % SIMPLIFY_INTERVAL == 0:
+            diagram, _ = simplify(diagram)
+            walker = RandomWalker(diagram, beta)
 
         if i > 2000:
             print('Iterations exceeded 2000; given diagram is most likely not an unknot.')
@@ -0,0 +1,135 @@
+from __future__ import annotations
+import heapq
+from unknotter.diagram import *
+from unknotter.reidemeister import MOVES, get_untwistables, get_pokables, get_unpokables, get_slidables
+from unknotter.walker import RandomWalker
+
+Move = tuple[str, tuple[Edge, ...]]
+
+class SearchResult:
+    """The outcome of a simplifying search.
+
+    Attributes:
+        diagram: the diagram with the fewest crossings that was found.
+        moves: the moves (a name in `MOVES` and its edges) that take the starting diagram to `diagram`.
+        states: the number of distinct diagrams seen, up to relabeling.
+        exhausted: whether every reachable diagram within the limits was expanded.
+    """
+    def __init__(self, diagram: Diagram, moves: list[Move], states: int, exhausted: bool):
+        self.diagram = diagram
+        self.moves = moves
+        self.states = states
+        self.exhausted = exhausted
+
+    def __repr__(self) -> str:
+        return f'SearchResult(crossings={len(self.diagram.pd_code)}, moves={len(self.moves)}, states={self.states}, exhausted={self.exhausted})'
+
+def _neighbors(self: Diagram, pokes: int) -> list[Move]:
+    """List the moves the search tries from a diagram, in a fixed order.
+
+    These are every untwist, unpoke and slide, and `pokes` pokes spread evenly
+    over the list of pokable pairs, since pokes add crossings and there are many.
+    """
+    moves: list[Move] = [('untwist', (edge,)) for edge in get_untwistables(self)]
+    moves += (('unpoke', edges) for edges in get_unpokables(self))
+    moves += (('slide', edges) for edges in get_slidables(self))
+    pokables = get_pokables(self) if pokes > 0 else []
+    if pokables:
+        chosen = dict.fromkeys(pokables[i*len(pokables) // pokes] for i in range(min(pokes, len(pokables))))
+        moves += (('poke', edges) for edges in chosen)
+    return moves
+
+def simplify_search(self: Diagram, max_states: int = 10000, max_depth: int = 50, pokes: int = 4, target: int = 2) -> SearchResult:
+    """Deterministically search for a sequence of moves that reduces the crossings of a diagram.
+
+    Diagrams are expanded best-first, fewest crossings first and then fewest
+    moves, trying the moves of `_neighbors` in order. A diagram that is the same
+    as one already seen up to relabeling (see `Diagram.canonical`) is pruned.
+    The search stops when a diagram has no more than `target` crossings, or
+    when `max_states` diagrams have been seen. Paths are at most `max_depth`
+    moves long. The same inputs always give the same result.
+    """
+    start_key = self.canonical()
+    # Each seen diagram maps to the diagram and move it was reached from.
+    parents: dict[tuple, tuple[tuple, Move] | None] = {start_key: None}
+    best, best_key = self, start_key
+    heap: list[tuple[int, int, int, Diagram]] = [(len(self.pd_code), 0, 0, self)]
+    counter = 1
+    exhausted = True
+
+    while heap:
+        crossings, depth, _, diagram = heapq.heappop(heap)
+        if crossings <= target: break
+        if depth >= max_depth: continue
+        key = diagram.canonical()
+        for move in _neighbors(diagram, pokes):
+            name, edges = move
+            try:
+                new = MOVES[name](diagram, *edges)
+            except (NotImplementedError, ReidemeisterError):
+                continue
+            new_key = new.canonical()
+            if new_key in parents: continue
+            parents[new_key] = (key, move)
+            if len(new.pd_code) < len(best.pd_code):
+                best, best_key = new, new_key
+            heapq.heappush(heap, (len(new.pd_code), depth + 1, counter, new))
+            counter += 1
+            if len(parents) >= max_states: break
+        if len(parents) >= max_states:
+            exhausted = False
+            break
+        if len(best.pd_code) <= target: break
+
+    moves: list[Move] = []
+    key = best_key
+    while parents[key] is not None:
+        key, move = parents[key]
+        moves.append(move)
+    moves.reverse()
+    return SearchResult(best, moves, len(parents), exhausted and not heap)
+
+def simplify(self: Diagram) -> tuple[Diagram, list[Move]]:
+    """Remove crossings of a diagram with untwists and unpokes until none are left.
+
+    The candidates are kept up to date by a `RandomWalker`, which after each
+    move only revisits the faces around the crossings that changed. When no
+    crossing can be removed, each slide is tried in turn, and the first one after
+    which an untwist or unpoke is possible is kept (slides undo themselves, so
+    the others are slid back). Slides never return to a diagram seen since
+    crossings were last removed, so the process always ends.
+
+    Returns the simplified diagram and the moves (see `Move`) that lead to it.
+    """
+    walker = RandomWalker(self, 0)
+    moves: list[Move] = []
+    seen = {self.canonical()}
+
+    def removals() -> list[Move]:
+        # Untwisting the last crossing would leave a diagram with no crossings.
+        untwists = [('untwist', (edge,)) for edge in walker.untwistables()] if len(walker.diagram.pd_code) > 1 else []
+        return untwists + [('unpoke', edges) for edges in walker.unpokables()]
+
+    while True:
+        for name, edges in removals():
+            try:
+                walker.apply(name, *edges)
+            except (NotImplementedError, ReidemeisterError):
+                continue
+            moves.append((name, edges))
+            seen = {walker.diagram.canonical()}
+            break
+        else:
+            for edges in walker.slidables():
+                try:
+                    walker.apply('slide', *edges)
+                except (NotImplementedError, ReidemeisterError):
+                    continue
+                key = walker.diagram.canonical()
+                if key not in seen and removals():
+                    seen.add(key)
+                    moves.append(('slide', edges))
+                    break
+                walker.apply('slide', *edges)
+            else:
+                return walker.diagram, moves
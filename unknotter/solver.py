@@ -0,0 +1,116 @@
+from __future__ import annotations
+import math
+import random
+import time
+from unknotter.diagram import *
+from unknotter.walker import RandomWalker
+
+class SolverResult:
+    """The outcome of an unknot solver run.
+
+    Attributes:
+        success: whether the diagram was reduced to two or fewer crossings (so it is an unknot).
+        diagram: the diagram with the fewest crossings found by any replica.
+        iterations: the number of moves made by each replica.
+        time: the wall-clock time of the run in seconds.
+        betas: the beta of each replica.
+        acceptance_rates: for each replica, the fraction of its proposed swaps that were accepted.
+    """
+    def __init__(self, success: bool, diagram: Diagram, iterations: int, time: float, betas: list[float], acceptance_rates: list[float]):
+        self.success = success
+        self.diagram = diagram
+        self.iterations = iterations
+        self.time = time
+        self.betas = betas
+        self.acceptance_rates = acceptance_rates
+
+    def __repr__(self) -> str:
+        return (f'SolverResult(success={self.success}, crossings={len(self.diagram.pd_code)}, '
+            f'iterations={self.iterations}, time={self.time:.3f}, acceptance_rates={self.acceptance_rates})')
+
+def _run_replica(pd_code: PDNotation, beta: float, steps: int, seed: str, deadline: float | None) -> tuple[PDNotation, PDNotation, int]:
+    """Randomly walk a diagram for up to `steps` moves, stopping early once it has two or fewer crossings.
+
+    Returns the final diagram, the diagram with the fewest crossings on the way, and the number of moves made.
+    """
+    walker = RandomWalker(Diagram(pd_code), beta, random.Random(seed))
+    best = walker.diagram
+    moves = 0
+    while moves < steps and len(walker.diagram.pd_code) > 2:
+        if deadline is not None and time.time() > deadline: break
+        diagram = walker.step()
+        moves += 1
+        if len(diagram.pd_code) < len(best.pd_code):
+            best = diagram
+    return list(walker.diagram.pd_code), list(best.pd_code), moves
+
+def parallel_tempering(self: Diagram, betas: list[float] = (0.5, 1, 1.5, 2), iterations: int | None = 2000, time_limit: float | None = None,
+                       swap_interval: int = 50, workers: int | None = 1, seed: int | None = None) -> SolverResult:
+    """Try to reduce a diagram to an unknot with random walks at several betas that exchange diagrams.
+
+    Each replica walks with the weights of `apply_random_move` at its own beta
+    for `swap_interval` moves, then neighbouring replicas propose to swap their
+    diagrams. Since a twist or poke changes the weights by e^(-2 beta) per added
+    crossing, a replica samples diagrams roughly in proportion to
+    e^(-2 beta n) for n crossings, and a swap is accepted with the Metropolis
+    probability for that distribution. Low betas explore larger diagrams, and
+    swaps carry what they find to the high betas that simplify them.
+
+    The run stops once any replica has two or fewer crossings, or when each
+    replica has made `iterations` moves or `time_limit` seconds have passed.
+    The replicas run across `workers` processes (all available cores if None).
+    """
+    t0 = time.time()
+    deadline = None if time_limit is None else t0 + time_limit
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+    betas = list(betas)
+    replicas = [list(self.pd_code) for _ in betas]
+    best = self
+    accepted = [0]*len(betas)
+    proposed = [0]*len(betas)
+    moves = 0
+
+    executor = None
+    if workers != 1:
+        # Imported here since it is slow to import and only needed with multiple workers.
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers)
+    try:
+        round_index = 0
+        while iterations is None or moves < iterations:
+            steps = swap_interval if iterations is None else min(swap_interval, iterations - moves)
+            arguments = [
+                (pd_code, beta, steps, f'{seed}:{round_index}:{i}', deadline)
+                for i, (pd_code, beta) in enumerate(zip(replicas, betas))]
+            if executor is None:
+                results = [_run_replica(*args) for args in arguments]
+            else:
+                results = list(executor.map(_run_replica, *zip(*arguments)))
+            replicas = [pd_code for pd_code, _, _ in results]
+            moves += max(moved for _, _, moved in results)
+            for _, best_pd_code, _ in results:
+                if len(best_pd_code) < len(best.pd_code):
+                    best = Diagram(best_pd_code)
+
+            if len(best.pd_code) <= 2: break
+            if deadline is not None and time.time() > deadline: break
+
+            # Propose swaps between neighbours, alternating between even and odd pairs.
+            for i in range(round_index % 2, len(betas) - 1, 2):
+                proposed[i] += 1
+                proposed[i + 1] += 1
+                exponent = 2*(betas[i] - betas[i + 1])*(len(replicas[i]) - len(replicas[i + 1]))
+                if exponent >= 0 or rng.random() < math.exp(exponent):
+                    replicas[i], replicas[i + 1] = replicas[i + 1], replicas[i]
+                    accepted[i] += 1
+                    accepted[i + 1] += 1
+            round_index += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return SolverResult(
+        len(best.pd_code) <= 2, best, moves, time.time() - t0, betas,
+        [a / p if p else 0.0 for a, p in zip(accepted, proposed)])
@@ -0,0 +1,150 @@
+from __future__ import annotations
+import random
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from unknotter.diagram import *
+from unknotter.reidemeister import MOVES, _random_move
+
+# Moves are stored by their index in `MOVES`, with the number of edges each takes.
+_MOVE_NAMES = list(MOVES)
+_MOVE_CODES = {name: code for code, name in enumerate(_MOVE_NAMES)}
+_ARITIES = [3 if name == 'slide' else 2 if name in ('poke', 'unpoke') else 1 for name in _MOVE_NAMES]
+
+# A trajectory file (.uktr) is laid out as:
+#   header: magic, version, move count, checkpoint interval, edge count and checkpoint count (see `_HEADER`)
+#   moves: the code of each move as uint8, then the edges of every move as int32
+#   checkpoints: for each checkpoint, its offset into the edges as int64, its
+#     crossing count as int32 and then its edges as int32
+_MAGIC = b'UKTR'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIQQQQ')
+
+def _little_endian(values: array) -> array:
+    """Return the values in little-endian byte order, for reading and writing files."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+class Trajectory:
+    """A compact record of a walk of Reidemeister moves from a starting diagram.
+
+    Only the code and edges of each move are stored, which takes 5 to 13 bytes
+    a move, along with the diagram every `checkpoint_interval` moves. The
+    diagram after any number of moves is found by replaying the moves from the
+    checkpoint before it. Moves are applied by name through `MOVES`, so they
+    replay exactly without the random draws that chose them.
+
+    Attributes:
+        codes: the index in `MOVES` of each move.
+        edges: the edges of every move, one move after another.
+        checkpoints: the edges of the diagram after every `checkpoint_interval` moves, starting with the first diagram.
+        checkpoint_offsets: the index in `edges` of the first move after each checkpoint.
+    """
+    def __init__(self, start: Diagram, checkpoint_interval: int = 1000):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint interval must be positive.")
+        self.checkpoint_interval = checkpoint_interval
+        self.codes = array('B')
+        self.edges = array('i')
+        self.checkpoints: list[array] = []
+        self.checkpoint_offsets: list[int] = []
+        self._current = start
+        self._checkpoint(start)
+
+    def _checkpoint(self, diagram: Diagram):
+        self.checkpoints.append(array('i', [edge for crossing in diagram.pd_code for edge in crossing]))
+        self.checkpoint_offsets.append(len(self.edges))
+
+    def append(self, move: str, edges: tuple[Edge, ...], diagram: Diagram | None = None):
+        """Record a move, given by its name in `MOVES` and its edges.
+
+        `diagram` is the diagram after the move, which is found by applying the
+        move if it is not given.
+        """
+        if diagram is None:
+            diagram = MOVES[move](self._current, *edges)
+        self.codes.append(_MOVE_CODES[move])
+        self.edges.extend(edges)
+        self._current = diagram
+        if len(self.codes) % self.checkpoint_interval == 0:
+            self._checkpoint(diagram)
+
+    def record(self, moves: int, beta: float, rng: random.Random = random):
+        """Extend the trajectory with `moves` random moves (see `apply_random_move`)."""
+        for _ in range(moves):
+            diagram, move, edges = _random_move(self._current, beta, rng)
+            self.append(move, edges, diagram)
+
+    def __len__(self) -> int:
+        """Return the number of moves."""
+        return len(self.codes)
+
+    def moves(self, start: int = 0) -> Iterator[tuple[str, tuple[Edge, ...]]]:
+        """Iterate over the names and edges of the moves from move `start` on."""
+        checkpoint = start // self.checkpoint_interval
+        offset = self.checkpoint_offsets[checkpoint]
+        for i in range(checkpoint * self.checkpoint_interval, len(self.codes)):
+            code = self.codes[i]
+            arity = _ARITIES[code]
+            if i >= start:
+                yield _MOVE_NAMES[code], tuple(self.edges[offset:offset + arity])
+            offset += arity
+
+    def _diagrams(self, start: int) -> Iterator[Diagram]:
+        """Yield the diagram after `start` moves and each one after it, replayed from the checkpoint before it."""
+        checkpoint = start // self.checkpoint_interval
+        code = self.checkpoints[checkpoint]
+        diagram = Diagram([tuple(code[i:i + 4]) for i in range(0, len(code), 4)])
+        for i, (move, edges) in enumerate(self.moves(checkpoint * self.checkpoint_interval), checkpoint * self.checkpoint_interval):
+            if i >= start: yield diagram
+            diagram = MOVES[move](diagram, *edges)
+        yield diagram
+
+    def __getitem__(self, i: int) -> Diagram:
+        """Return the diagram after `i` moves, so the first diagram is at 0 and the last at `len(self)`."""
+        if i < 0:
+            i += len(self) + 1
+        if not 0 <= i <= len(self):
+            raise IndexError("trajectory index out of range")
+        return next(self._diagrams(i))
+
+    def __iter__(self) -> Iterator[Diagram]:
+        """Lazily replay every diagram of the trajectory, from the first to the last."""
+        return self._diagrams(0)
+
+    def save(self, filename: str):
+        """Write the trajectory to a .uktr file, laid out as described at the top of this module."""
+        with open(filename, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(self.codes), self.checkpoint_interval, len(self.edges), len(self.checkpoints)))
+            f.write(self.codes.tobytes())
+            f.write(_little_endian(self.edges).tobytes())
+            for offset, checkpoint in zip(self.checkpoint_offsets, self.checkpoints):
+                f.write(struct.pack('<qi', offset, len(checkpoint) // 4))
+                f.write(_little_endian(checkpoint).tobytes())
+
+    @classmethod
+    def load(cls, filename: str) -> Trajectory:
+        """Read a trajectory from a .uktr file written by `save`."""
+        with open(filename, 'rb') as f:
+            magic, version, n_moves, checkpoint_interval, n_edges, n_checkpoints = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{filename} is not a trajectory file.")
+            trajectory = cls.__new__(cls)
+            trajectory.checkpoint_interval = checkpoint_interval
+            trajectory.codes = array('B', f.read(n_moves))
+            trajectory.edges = array('i')
+            trajectory.edges.frombytes(f.read(4 * n_edges))
+            trajectory.edges = _little_endian(trajectory.edges)
+            trajectory.checkpoints = []
+            trajectory.checkpoint_offsets = []
+            for _ in range(n_checkpoints):
+                offset, n_crossings = struct.unpack('<qi', f.read(12))
+                checkpoint = array('i')
+                checkpoint.frombytes(f.read(16 * n_crossings))
+                trajectory.checkpoints.append(_little_endian(checkpoint))
+                trajectory.checkpoint_offsets.append(offset)
+        trajectory._current = trajectory[len(trajectory)]
+        return trajectory
@@ -0,0 +1,244 @@
+import math
+import random
+from typing import Callable
+from unknotter.diagram import *
+from unknotter.instrumentation import instrumented
+from unknotter.properties import is_infinity_unknot
+from unknotter.reidemeister import MOVES, _is_unpokable, _is_slidable
+
+Face = frozenset[Edge]
+
+_TWISTS = ['left_positive_twist', 'left_negative_twist', 'right_positive_twist', 'right_negative_twist']
+
+def _shift_past_ends(edges: list[Edge], n_edges: int) -> int:
+    """Count how many times a move shifts the diagram by one before it applies.
+
+    `untwist`, `unpoke` and the twists shift the diagram and retry whenever one of
+    their edges is the first or last edge.
+    """
+    shifts = 0
+    while any(edge == 1 or edge == n_edges for edge in edges):
+        edges = [edge % n_edges + 1 for edge in edges]
+        shifts += 1
+    return shifts
+
+def _relabeling(self: Diagram, move: str, edges: tuple[Edge, ...]) -> Callable[[Edge], Edge | None] | None:
+    """Return the map from edges of `self` to edges of the diagram after the move.
+
+    Edges next to the move may not keep their identity, so they map to None.
+    Returns None if the move is a special case with no simple relabeling.
+    """
+    n_edges = 2*len(self.pd_code)
+
+    if move in _TWISTS or move == 'untwist':
+        if is_infinity_unknot(self): return None
+        shifts = _shift_past_ends(list(edges), n_edges)
+        target = (edges[0] + shifts - 1) % n_edges + 1
+        def shifted(edge: Edge) -> Edge:
+            return (edge + shifts - 1) % n_edges + 1
+        if move == 'untwist':
+            return lambda edge: (
+                None if target - 1 <= shifted(edge) <= target + 1 else
+                shifted(edge) - 2 if shifted(edge) > target else shifted(edge))
+        return lambda edge: (
+            None if shifted(edge) == target else
+            shifted(edge) + 2 if shifted(edge) > target else shifted(edge))
+
+    if move == 'poke':
+        if len(self.pd_code) <= 1: return None
+        lower_edge, higher_edge = min(edges), max(edges)
+        return lambda edge: (
+            None if edge in (lower_edge, higher_edge) else
+            edge if edge < lower_edge else
+            edge + 2 if edge < higher_edge else edge + 4)
+
+    if move == 'unpoke':
+        shifts = _shift_past_ends(list(edges), n_edges)
+        lower_edge, higher_edge = sorted((edge + shifts - 1) % n_edges + 1 for edge in edges)
+        def unpoked(edge: Edge) -> Edge | None:
+            edge = (edge + shifts - 1) % n_edges + 1
+            if lower_edge - 1 <= edge <= lower_edge + 1 or higher_edge - 1 <= edge <= higher_edge + 1:
+                return None
+            return edge if edge < lower_edge else edge - 2 if edge < higher_edge else edge - 4
+        return unpoked
+
+    if move == 'slide':
+        return lambda edge: edge
+
+    return None
+
+def _untwistable_edge(crossing: Crossing) -> Edge | None:
+    """Return the edge that can be untwisted at a crossing, if any (see `get_untwistables`)."""
+    if len(set(crossing)) == 3:
+        return max(set(crossing), key=crossing.count)
+    return None
+
+class RandomWalker:
+    """A random walk of Reidemeister moves that keeps its move candidates up to date.
+
+    `apply_random_move` enumerates every candidate move from scratch after each
+    move. A move only changes a few crossings, so the walker instead keeps the
+    faces of the diagram (as sets of edges) and, after each move, relabels the
+    faces away from the move and walks only the faces touching changed crossings.
+    The candidates for untwists, pokes, unpokes and slides are read off of these
+    faces and have the same distribution as the ones `apply_random_move` draws from.
+    """
+    def __init__(self, diagram: Diagram, beta: float, rng: random.Random = random):
+        self.beta = beta
+        self.rng = rng
+        self.numerical_weights: list[float] = [
+            math.e**-beta,
+            math.e**beta,
+            math.e**(-2*beta),
+            math.e**(2*beta),
+            1
+        ]
+        self._rebuild(diagram)
+
+    def _rebuild(self, diagram: Diagram):
+        """Compute all faces and candidates of a diagram from scratch."""
+        self.diagram = diagram
+        self._faces: dict[Face, int] = {}
+        self._bigons: dict[Face, int] = {}
+        self._triangles: dict[Face, int] = {}
+        for face in diagram.faces().faces:
+            self._add_face(frozenset(abs(edge) for edge in face))
+        self._kinks: set[Crossing] = {crossing for crossing in diagram.pd_code if _untwistable_edge(crossing) is not None}
+
+    def _add_face(self, face: Face):
+        """Add a face of the current diagram, noting whether it can be unpoked or slid."""
+        self._faces[face] = self._faces.get(face, 0) + 1
+        if len(face) == 2 and _is_unpokable(self.diagram, *face):
+            self._bigons[face] = self._bigons.get(face, 0) + 1
+        if len(face) == 3 and _is_slidable(self.diagram, *face):
+            self._triangles[face] = self._triangles.get(face, 0) + 1
+
+    @instrumented('update')
+    def apply(self, move: str, *edges: Edge) -> Diagram:
+        """Apply a move by its name in `MOVES` and update the candidates."""
+        old = self.diagram
+        new = MOVES[move](old, *edges)
+        relabel = _relabeling(old, move, edges)
+        if relabel is None or len(new.pd_code) <= 3:
+            self._rebuild(new)
+            return new
+
+        # Find the crossings that survive the move with relabeled edges.
+        new_crossings = set(new.pd_code)
+        unchanged: dict[Crossing, Crossing] = {}
+        for crossing in old.pd_code:
+            relabeled = tuple(relabel(edge) for edge in crossing)
+            if relabeled in new_crossings:
+                unchanged[crossing] = relabeled
+        touched_edges = {edge for crossing in old.pd_code if crossing not in unchanged for edge in crossing}
+        surviving = set(unchanged.values())
+        touched_indices = [i for i, crossing in enumerate(new.pd_code) if crossing not in surviving]
+
+        self.diagram = new
+        # Faces away from the changed crossings keep their shape and whether
+        # they can be unpoked or slid, so they are only relabeled.
+        def relabel_faces(faces: dict[Face, int]) -> dict[Face, int]:
+            return {
+                frozenset(relabel(edge) for edge in face): count
+                for face, count in faces.items()
+                if face.isdisjoint(touched_edges)}
+        self._faces = relabel_faces(self._faces)
+        self._bigons = relabel_faces(self._bigons)
+        self._triangles = relabel_faces(self._triangles)
+        self._kinks = {unchanged[crossing] for crossing in self._kinks if crossing in unchanged}
+
+        # Walk the faces with a corner at a changed crossing.
+        visited: set[tuple[int, int]] = set()
+        for crossing_index in touched_indices:
+            crossing = new.pd_code[crossing_index]
+            if _untwistable_edge(crossing) is not None:
+                self._kinks.add(crossing)
+            for edge_index in range(4):
+                if (crossing_index, edge_index) in visited: continue
+                face: list[Edge] = []
+                index = (crossing_index, edge_index)
+                while index not in visited:
+                    visited.add(index)
+                    face.append(new.pd_code[index[0]][index[1]])
+                    friend_crossing_index, friend_edge_index = new._get_friend_index(*index)
+                    index = (friend_crossing_index, (friend_edge_index - 1) % 4)
+                self._add_face(frozenset(face))
+        return new
+
+    @instrumented('enumerate')
+    def twistables(self) -> list[Edge]:
+        return list(range(1, 2*len(self.diagram.pd_code) + 1))
+
+    @instrumented('enumerate')
+    def untwistables(self) -> list[Edge]:
+        return sorted(_untwistable_edge(crossing) for crossing in self._kinks)
+
+    @instrumented('enumerate')
+    def pokables(self) -> list[tuple[Edge, Edge]]:
+        pokables: set[tuple[Edge, Edge]] = set()
+        for face in self._faces:
+            pokables.update((edge1, edge2) for edge1 in face for edge2 in face if edge1 != edge2)
+        return sorted(pokables)
+
+    def _scan(self, faces: list[Face]) -> list[tuple[Edge, ...]]:
+        """Order candidate faces the way `get_unpokables` and `get_slidables` find them.
+
+        Those scan the edges in order, skipping any edge that already lies on a
+        candidate, so a face whose edges are all on earlier candidates is missed.
+        """
+        faces_by_edge: dict[Edge, list[Face]] = {}
+        for face in faces:
+            for edge in face:
+                faces_by_edge.setdefault(edge, []).append(face)
+        found: list[tuple[Edge, ...]] = []
+        covered: set[Edge] = set()
+        for edge in sorted(faces_by_edge):
+            if edge in covered: continue
+            for face in faces_by_edge[edge]:
+                found.append(tuple(sorted(face)))
+                covered.update(face)
+        return found
+
+    @instrumented('enumerate')
+    def unpokables(self) -> list[tuple[Edge, Edge]]:
+        if len(self.diagram.pd_code) <= 2:
+            return []
+        return self._scan([face for face, count in self._bigons.items() for _ in range(count)])
+
+    @instrumented('enumerate')
+    def slidables(self) -> list[tuple[Edge, Edge, Edge]]:
+        return self._scan([face for face, count in self._triangles.items() for _ in range(count)])
+
+    def step(self) -> Diagram:
+        """Apply a random move with the same distribution as `apply_random_move`."""
+        while True:
+            options: list[Callable[[], list]] = [self.twistables, self.untwistables, self.pokables, self.unpokables, self.slidables]
+            # Only check whether the candidates exist, since listing every
+            # pokable pair is only needed if a poke is chosen.
+            exists = [
+                len(self.diagram.pd_code) > 0,
+                bool(self._kinks),
+                any(len(face) > 1 for face in self._faces),
+                len(self.diagram.pd_code) > 2 and bool(self._bigons),
+                bool(self._triangles),
+            ]
+            weights = [w if e else 0 for w, e in zip(self.numerical_weights, exists)]
+            move_decision = self.rng.choices(range(5), weights=weights)[0]
+            edges = self.rng.choices(options[move_decision]())[0]
+            match move_decision:
+                case 0:
+                    move = self.rng.choices(_TWISTS)[0]
+                    edges = (edges,)
+                case 1:
+                    move = 'untwist'
+                    edges = (edges,)
+                case 2:
+                    move = 'poke'
+                case 3:
+                    move = 'unpoke'
+                case 4:
+                    move = 'slide'
+            try:
+                return self.apply(move, *edges)
+            except NotImplementedError:
+                continue